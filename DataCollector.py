@@ -1,34 +1,100 @@
-from __future__ import division
-import numpy
-from benchmark import Benchmark
-from shapely.geometry import LineString, Point, Polygon
-from visualize import Visualize
-from sklearn import svm
-from sklearn.metrics import confusion_matrix
-from auxillary import check_label_diversity, confusion_test, write_data_to_csv
-import matplotlib.pyplot as plt
-def datacollector(n_start,n_end,iterations,gamma,training_data_restriction,kernel_type,training_data_type="poly",degree_of_polynomial=1):
-    """
-
-    :param n_start: Starting point for number of data points
-    :param n_end:  Ending point for number of data points
-    :param iterations: Iterations over whih errors will be averaged for each n, the number of data points
-    :param gamma:
-    :param training_data_restriction: Values from 0-1 specify what percentage of available training data to be used for training
-    :param kernel_type: "poly","rbf","linear" or "sigmoid"
-    :param training_data_type: calls the corresponding function fro Benchmark. Currently wdefaulted to "poly"
-    :param degree_of_polynomial: Degree of polynomial for the corresponding data type
-    :return: Stores (x,y) on excel sheet with x: no. of data points and y: average number of errors over specified iterations
-    """
-    average_error = []
-    sum = 0
-    for j in range(n_start, n_end):
-        for i in range(iterations):
-            x = Benchmark.generate_polynomial(j, gamma, degree_of_polynomial)
-            while (check_label_diversity(x[1])):
-                x = Benchmark.generate_polynomial(j, gamma, degree_of_polynomial)
-            sum += confusion_test(x, training_data_restriction, kernel_type)
-        average_error.append([j, float(sum / iterations)])
-        sum = 0
-    write_data_to_csv(average_error, "_Tdatatype "+ training_data_type+"_KType "+ kernel_type+ "_n_range " + str(n_start)+"-" +str(n_end))
-datacollector(100,105,10,0.2,0.5,"poly","poly",2)
\ No newline at end of file
+from __future__ import division
+import time
+from benchmark import Benchmark
+from auxillary import check_label_diversity, confusion_test, write_data_to_csv
+from sweep import run_sweep
+from results import ResultSink
+from streaming import stream_errors
+def collect_cell(j, gamma, training_data_restriction, kernel_type, degree_of_polynomial, learner="svc", c=1.0):
+    """ Generate a single data-set of j points, and count the errors of the classifier trained on it.
+
+    :param j: Number of data points
+    :param gamma: Minimum separation between the two "classes" of data
+    :param training_data_restriction: Values from 0-1 specify what percentage of available training data to be used for training
+    :param kernel_type: "poly","rbf","linear" or "sigmoid"
+    :param degree_of_polynomial: Degree of polynomial for the corresponding data type
+    :param learner: "svc" fits an SVC to the whole data-set in memory. "sgd" streams it in chunks to a linear SVM (see streaming.stream_errors)
+    :param c: Complexity penalty of the SVC
+    :return: Number of errors over the whole data-set, and the seconds taken
+    """
+    start = time.perf_counter()
+    if learner == "sgd":
+        return stream_errors(j, gamma, training_data_restriction, kernel_type, "polynomial", degree=degree_of_polynomial), time.perf_counter() - start
+    x = Benchmark.generate_polynomial(j, gamma, degree_of_polynomial)
+    while (check_label_diversity(x[1])):
+        x = Benchmark.generate_polynomial(j, gamma, degree_of_polynomial)
+    return confusion_test(x, training_data_restriction, kernel_type, c), time.perf_counter() - start
+def collect_nested(n_start, n_end, gamma, training_data_restriction, kernel_type, degree_of_polynomial):
+    """ Generate one data-set of n_end - 1 points about a single boundary, and count the errors of the classifier trained on each prefix of it.
+    The data-set for j + 1 points is the data-set for j points plus one more point.
+
+    :param n_start: Starting point for number of data points
+    :param n_end:  Ending point for number of data points
+    :param gamma: Minimum separation between the two "classes" of data
+    :param training_data_restriction: Values from 0-1 specify what percentage of available training data to be used for training
+    :param kernel_type: "poly","rbf","linear" or "sigmoid"
+    :param degree_of_polynomial: Degree of polynomial for the corresponding data type
+    :return: Number of errors and seconds taken for each n in range(n_start, n_end). Generation time is counted in the first n
+    """
+    start = time.perf_counter()
+    x = Benchmark.generate_polynomial(n_end - 1, gamma, degree_of_polynomial)
+    while (check_label_diversity(x[1][:n_start])):
+        x = Benchmark.generate_polynomial(n_end - 1, gamma, degree_of_polynomial)
+    results = []
+    for j in range(n_start, n_end):
+        results.append((confusion_test((x[0][:j], x[1][:j], x[2]), training_data_restriction, kernel_type), time.perf_counter() - start))
+        start = time.perf_counter()
+    return results
+def datacollector(n_start,n_end,iterations,gamma,training_data_restriction,kernel_type,training_data_type="poly",degree_of_polynomial=1,seed=None,workers=1,chunksize=1,nested=False,log=None,xlsx=True,learner="svc"):
+    """
+
+    :param n_start: Starting point for number of data points
+    :param n_end:  Ending point for number of data points
+    :param iterations: Iterations over whih errors will be averaged for each n, the number of data points
+    :param gamma:
+    :param training_data_restriction: Values from 0-1 specify what percentage of available training data to be used for training
+    :param kernel_type: "poly","rbf","linear" or "sigmoid"
+    :param training_data_type: calls the corresponding function fro Benchmark. Currently wdefaulted to "poly"
+    :param degree_of_polynomial: Degree of polynomial for the corresponding data type
+    :param seed: Master seed. Each (n, iteration) cell draws from its own stream derived from it, so results do not depend on workers
+    :param workers: Number of processes to spread the (n, iteration) cells over
+    :param chunksize: Number of cells sent to a worker at once
+    :param nested: If true, each iteration fixes one boundary and grows a single data-set, so the data-set for n + 1 is the one for n plus one point
+    :param log: CSV file each finished (n, iteration) cell is appended to. Cells already in it are skipped, so an interrupted sweep can be resumed. The log records the parameters of the sweep (gamma, kernel, seed, ...), and a sweep with other parameters refuses to resume it
+    :param xlsx: If true, export the averages to an excel sheet once the sweep finishes
+    :param learner: "svc" fits an SVC to each data-set in memory. "sgd" streams each data-set in chunks to a linear SVM, for n too large to hold (not with nested)
+    :return: List of [n, average number of errors over the specified iterations]. Also stored on an excel sheet if xlsx is true
+    """
+    if nested and learner != "svc":
+        raise ValueError("Nested sweeps only support the svc learner")
+    params = {"gamma": gamma, "training_data_restriction": training_data_restriction, "kernel_type": kernel_type, "training_data_type": training_data_type,
+              "degree_of_polynomial": degree_of_polynomial, "seed": seed, "nested": nested, "learner": learner}
+    sink = ResultSink(log, params) if log is not None else None
+    records = sink.records if sink is not None else {}
+    try:
+        if nested:
+            cells = [((i,), (n_start, n_end, gamma, training_data_restriction, kernel_type, degree_of_polynomial))
+                     for i in range(iterations) if any((j, i) not in records for j in range(n_start, n_end))]
+            for ((i,), args), results in zip(cells, run_sweep(collect_nested, cells, seed, workers, chunksize)):
+                for j, (errors, seconds) in zip(range(n_start, n_end), results):
+                    if (j, i) not in records:
+                        sink.append(j, i, errors, seconds) if sink is not None else records.update({(j, i): errors})
+        else:
+            cells = [((j, i), (j, gamma, training_data_restriction, kernel_type, degree_of_polynomial, learner))
+                     for j in range(n_start, n_end) for i in range(iterations) if (j, i) not in records]
+            for ((j, i), args), (errors, seconds) in zip(cells, run_sweep(collect_cell, cells, seed, workers, chunksize)):
+                sink.append(j, i, errors, seconds) if sink is not None else records.update({(j, i): errors})
+    finally:
+        # Flush the finished cells on any exit, including an exception or an interrupt.
+        sink is not None and sink.close()
+    average_error = []
+    for j in range(n_start, n_end):
+        sum = 0
+        for i in range(iterations):
+            sum += records[(j, i)]
+        average_error.append([j, float(sum / iterations)])
+    if xlsx:
+        write_data_to_csv(average_error, "_Tdatatype "+ training_data_type+"_KType "+ kernel_type+ "_n_range " + str(n_start)+"-" +str(n_end))
+    return average_error
+if __name__ == "__main__":
+    datacollector(100,105,10,0.2,0.5,"poly","poly",2)
@@ -0,0 +1,135 @@
+""""
+Filename:    adaptive.py
+
+Description: This file contains an adaptive sweep scheduler. Rather than a fixed number of fits per
+             n, each (n, kernel, C) cell keeps a running mean and confidence interval of its errors,
+             and stops once the interval is narrow enough (within a minimum and maximum number of
+             iterations). Configurations of (kernel, C) that are clearly worse than the best one
+             for an n are pruned by successive halving.
+"""""
+
+import csv
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from DataCollector import collect_cell
+from sweep import run_sweep
+
+
+class RunningStats(object):
+    """ Running mean and variance of a stream of values (Welford's algorithm). """
+
+    def __init__(self):
+        self.count, self.mean, self.m2 = 0, 0.0, 0.0
+
+    def update(self, x):
+        """ Add a value to the stream.
+
+        :param x: Value to add.
+        :return: None.
+        """
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def variance(self):
+        """ Sample variance of the values so far. """
+        return self.m2 / (self.count - 1) if self.count > 1 else math.inf
+
+    def half_width(self, z=1.96):
+        """ Find the half-width of the (normal) confidence interval of the mean.
+
+        :param z: Quantile of the interval, e.g. 1.96 for 95%.
+        :return: Half-width of the interval. Infinite for fewer than two values.
+        """
+        return z * math.sqrt(self.variance / self.count) if self.count > 1 else math.inf
+
+
+def adaptive_sweep(n_values, gamma, training_data_restriction, configs, degree_of_polynomial=1,
+                   min_iterations=3, max_iterations=30, target=0.5, z=1.96, eta=2, seed=None,
+                   workers=1, chunksize=1, out=None):
+    """ Run a sweep over n and (kernel, C), stopping each cell once the confidence interval of its
+    mean number of errors is narrower than the target. Iterations are run in rounds: one more fit
+    for every active cell, spread over the workers. After min_iterations * eta^r iterations
+    (r = 0, 1, ...), only the best 1 / eta of the configurations for each n are kept, along with
+    any whose interval overlaps that of the best configuration.
+
+    :param n_values: Numbers of data points to sweep over.
+    :param gamma: Minimum separation between the two "classes" of data.
+    :param training_data_restriction: Values from 0-1 specify what percentage of the data-set to
+                                      train with.
+    :param configs: List of (kernel, C) configurations to sweep over.
+    :param degree_of_polynomial: Degree of the polynomial decision boundary.
+    :param min_iterations: Number of iterations each cell runs before it may stop.
+    :param max_iterations: Number of iterations after which each cell stops.
+    :param target: Half-width of the confidence interval at which a cell stops.
+    :param z: Quantile of the confidence interval, e.g. 1.96 for 95%.
+    :param eta: Fraction of configurations kept at each halving is 1 / eta. If 1, none are pruned.
+    :param seed: Master seed. Each (n, iteration) has its own random stream, shared by the fits
+                 of every configuration, so they are compared on the same data-sets.
+    :param workers: Number of processes to spread the fits of each round over. One pool is started
+                    for the whole sweep.
+    :param chunksize: Number of fits sent to a worker at once.
+    :param out: If defined, CSV file to write the rows to.
+    :return: List of [n, kernel, C, mean errors, half-width, iterations, status] for each cell.
+             Status is one of converged, max_iterations, or pruned.
+    """
+    seed = np.random.SeedSequence().entropy if seed is None else seed
+    stats = {(n, k): RunningStats() for n in n_values for k in range(len(configs))}
+    status = {cell: None for cell in stats}
+    rung = min_iterations
+
+    # One pool serves every round, so worker processes are only started once.
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        while any(s is None for s in status.values()):
+            # Run one more iteration of every active cell. Fits are seeded by (n, iteration), so
+            # every configuration of an n is scored on the same data-sets (common random numbers).
+            active = [cell for cell, s in status.items() if s is None]
+            fits = [((n, stats[(n, k)].count),
+                     (n, gamma, training_data_restriction, configs[k][0], degree_of_polynomial,
+                      "svc", configs[k][1])) for n, k in active]
+            results = run_sweep(collect_cell, fits, seed, workers, chunksize, executor)
+            for cell, (errors, seconds) in zip(active, results):
+                stats[cell].update(errors)
+
+            # Stop the cells whose interval is narrow enough, or who have run out of iterations.
+            for cell in active:
+                s = stats[cell]
+                if s.count >= min_iterations and s.half_width(z) <= target:
+                    status[cell] = "converged"
+                elif s.count >= max_iterations:
+                    status[cell] = "max_iterations"
+
+            # Successive halving. Compare the configurations of each n once all reach the rung.
+            if eta > 1 and all(stats[cell].count >= rung for cell in active):
+                for n in n_values:
+                    ranked = sorted([k for k in range(len(configs)) if status[(n, k)] != "pruned"],
+                                    key=lambda k: stats[(n, k)].mean)
+                    best, keep = stats[(n, ranked[0])], ranked[:int(math.ceil(len(ranked) / eta))]
+
+                    # Only prune the configurations whose interval lies wholly above the best one.
+                    for k in ranked[len(keep):]:
+                        s = stats[(n, k)]
+                        clearly_worse = s.mean - s.half_width(z) > best.mean + best.half_width(z)
+                        status[(n, k)] is None and clearly_worse and \
+                            status.update({(n, k): "pruned"})
+                rung *= eta
+    finally:
+        executor is not None and executor.shutdown()
+
+    rows = [[n, configs[k][0], configs[k][1], stats[(n, k)].mean, stats[(n, k)].half_width(z),
+             stats[(n, k)].count, status[(n, k)]] for n, k in sorted(stats)]
+
+    if out is not None:
+        with open(out, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["n", "kernel", "C", "mean_errors", "half_width", "iterations",
+                             "status"])
+            writer.writerows(rows)
+
+    return rows
@@ -6,9 +6,73 @@ Description: This file contains an n-D training data generation class. This gene
              classification tags.
 """""
 
+import itertools
+import time
+
 import numpy as np
-import shapely.affinity
-from shapely.geometry import LineString, Point, Polygon
+
+from geometry import Ellipse, PolylineIndex, Rectangle
+
+
+class SamplingBudgetExceeded(RuntimeError):
+    """ Raised when a generator draws more candidates, or runs longer, than its budget allows. The
+    SamplingStats of the call, up to the failure, are held in 'stats'.
+    """
+
+    def __init__(self, message, stats=None):
+        super(SamplingBudgetExceeded, self).__init__(message)
+        self.stats = stats
+
+
+class SamplingStats(object):
+    """ Statistics of a single call to a generator: the candidates it drew and scored, and the time 
+    it spent constructing the boundary, sampling points, and labeling them.
+    """
+
+    def __init__(self):
+        self.begin(None, 0, 0)
+
+    def begin(self, generator, n, gamma):
+        """ Reset the statistics for a new call, and start its clock.
+
+        :param generator: Name of the generator called.
+        :param n: Number of points requested.
+        :param gamma: Minimum separation requested.
+        :return: These statistics.
+        """
+        self.generator, self.n, self.gamma = generator, n, gamma
+        self.candidates, self.accepted, self.distance_calls = 0, 0, 0
+        self.boundary_seconds, self.sampling_seconds, self.labeling_seconds = 0.0, 0.0, 0.0
+        self.start = self.last = time.perf_counter()
+
+        return self
+
+    def lap(self, phase):
+        """ Charge the time since the last lap to the given phase.
+
+        :param phase: One of boundary, sampling, or labeling.
+        :return: None.
+        """
+        now = time.perf_counter()
+        setattr(self, phase + "_seconds", getattr(self, phase + "_seconds") + now - self.last)
+        self.last = now
+
+    @property
+    def acceptance_rate(self):
+        """ Fraction of the candidates drawn that met the gamma condition. """
+        return self.accepted / self.candidates if self.candidates > 0 else 0.0
+
+    @property
+    def distance_evaluations(self):
+        """ Number of point-to-boundary distances computed. Every candidate is scored once. """
+        return self.candidates
+
+    def __repr__(self):
+        return ("SamplingStats(%s, n=%d, gamma=%g, candidates=%d, acceptance_rate=%.3g, "
+                "distance_calls=%d, boundary=%.3gs, sampling=%.3gs, labeling=%.3gs)" %
+                (self.generator, self.n, self.gamma, self.candidates, self.acceptance_rate,
+                 self.distance_calls, self.boundary_seconds, self.sampling_seconds,
+                 self.labeling_seconds))
 
 
 class Benchmark(object):
@@ -16,11 +80,28 @@ class Benchmark(object):
                  generate_polynomial = Generate a list of points separated by a polynomial.
                  generate_ellipse = Generate a list of points separated by an ellipse.
                  generate_rectangle = Generate a list of points separated by a rectangle.
+                 stream = Generate a data-set in chunks, about a single decision boundary.
     """
 
     # Points to generate to check if gamma condition is satisfied for polynomials.
     GCP = 1000
 
+    # Smallest block of candidates to draw, and the largest block (in elements) to hold at once.
+    MIN_BLOCK = 64
+    BLOCK_ELEMENTS = 2 ** 20
+
+    # Budget of each call to a generator. If exceeded, SamplingBudgetExceeded is raised.
+    MAX_CANDIDATES = None
+    MAX_SECONDS = None
+
+    # If defined, called with the SamplingStats of every call to a generator.
+    HOOK = None
+
+    # Constructive sampling splits the sampled square into at most 4^STRATA_DEPTH (and never more 
+    # than MAX_STRATA) cells, keeping only those that may hold a point passing the gamma condition.
+    STRATA_DEPTH = 8
+    MAX_STRATA = 2 ** 16
+
     @staticmethod
     def random_vector(i):
         """ Generate a normalized random vector of length 'i'. Range: [-1, 1].
@@ -31,26 +112,252 @@ class Benchmark(object):
         return 2 * np.random.rand(i) - 1
 
     @staticmethod
-    def __d_passing_gamma(n, gamma, distance_to_b, i=2, scale=1):
+    def random_matrix(m, i):
+        """ Generate a matrix of 'm' normalized random vectors of length 'i'. Range: [-1, 1]. Rows 
+        are drawn from the same stream as 'm' successive calls to random_vector.
+
+        :param m: Number of vectors (rows) to generate.
+        :param i: Length of each vector to generate.
+        :return: An m * i matrix.
+        """
+        return 2 * np.random.rand(m, i) - 1
+
+    @staticmethod
+    def __d_passing_gamma(n, gamma, distance_to_b, i=2, scale=1, stats=None, propose=None,
+                          out=None, dtype=np.float64):
         """ Generate a random list of points whose distance to the decision boundary is greater 
-        than the given gamma.
+        than the given gamma. Candidates are drawn and scored in blocks, whose size is derived from 
+        the acceptance rate observed so far.
         
         :param n: Number of points to generate. These are randomly plotted.
         :param gamma: Minimum separation between the two "classes" of data in D.
-        :param distance_to_b: Distance finding function. 
+        :param distance_to_b: Vectorized distance finding function. Maps an m * i matrix of 
+                              points to a m-long vector of distances.
         :param i: Dimensionality of the points themselves (2D, 3D, etc...).
         :param scale: The scale of the points and the decision boundary. Defaults to 1.
-        :return: Vector of points that meet the defined gamma condition.
+        :param stats: SamplingStats to record the candidates drawn in.
+        :param propose: Maps a block size m to an m * i matrix of candidates, drawn uniformly from 
+                        a region that holds every point passing the gamma condition. If None, 
+                        candidates are drawn from the whole square [-scale, scale]^i.
+        :param out: n * i matrix to write the points into. If None, a new one is allocated.
+        :param dtype: Type of the points. Candidates are rounded to it before they are scored.
+        :return: n * i matrix of points that meet the defined gamma condition.
         """
-        d = []
-        while len(d) < n:
-            p = Benchmark.random_vector(i) * scale
-            distance_to_b(p) > gamma and d.append(p)
+        propose = (lambda m: Benchmark.random_matrix(m, i) * scale) if propose is None else propose
+        d = np.empty((n, i), dtype) if out is None else out
+        if d.shape != (n, i):
+            raise ValueError("Expected an output buffer of shape %s, got %s." % ((n, i), d.shape))
+        accepted, passed, drawn, start = 0, 0, 0, time.perf_counter()
+
+        # Bound the memory used by a single block of candidates.
+        max_block = max(1, Benchmark.BLOCK_ELEMENTS // i)
+
+        while accepted < n:
+            # Size the next block so that it is expected to fill the remaining rows (with slack).
+            rate = passed / drawn if passed > 0 else 1 / (drawn + 1)
+            block = int(np.clip(np.ceil(1.1 * (n - accepted) / rate), Benchmark.MIN_BLOCK,
+                                max_block))
+
+            # Never draw past the candidate budget.
+            if Benchmark.MAX_CANDIDATES is not None:
+                block = min(block, Benchmark.MAX_CANDIDATES - drawn)
+
+            p = propose(block).astype(d.dtype, copy=False)
+            p = p[distance_to_b(p) > gamma]
+            passed += len(p)
+
+            # Candidates past the n-th are dropped, but still count towards the acceptance rate.
+            p = p[:n - accepted]
+            d[accepted:accepted + len(p)] = p
+            accepted, drawn = accepted + len(p), drawn + block
+
+            if stats is not None:
+                stats.candidates, stats.accepted = drawn, passed
+                stats.distance_calls += 1
+
+            # Give up on cases that cannot be satisfied (or not quickly enough).
+            # The statistics of the failed call are still charged and reported.
+            if accepted < n and Benchmark.__over_budget(drawn, time.perf_counter() - start):
+                if stats is not None:
+                    stats.lap("sampling")
+                    Benchmark.__report(stats)
+                raise SamplingBudgetExceeded(
+                    "Sampling budget exceeded: %d of %d points accepted from %d candidates "
+                    "(acceptance rate %.3g) with gamma = %g." % (
+                        accepted, n, drawn, passed / drawn if drawn > 0 else 0.0, gamma), stats)
 
         return d
 
     @staticmethod
-    def generate_linear(n, gamma, i, scale=1):
+    def __strata(gamma, distance_bounds, axes, i=2, scale=1):
+        """ Build a proposal for constructive sampling. The square spanned by the given axes is 
+        split recursively into cells. A cell is dropped once the bounds show that none of its points 
+        pass the gamma condition, kept whole once all of them do, and split otherwise (down to 
+        STRATA_DEPTH levels). Candidates are drawn uniformly from the union of the kept cells (a 
+        cell is picked with probability proportional to its area), and uniformly over the remaining 
+        axes. As every dropped point fails the gamma condition, accepting the candidates that pass 
+        it gives exactly the distribution of rejection sampling over the whole square.
+
+        :param gamma: Minimum separation between the two "classes" of data in D.
+        :param distance_bounds: Maps the centers (m * len(axes)) and half-widths of m cells to 
+                                lower and upper bounds of the distance to the decision boundary 
+                                over each cell.
+        :param axes: Axes to split the square along (at most two).
+        :param i: Dimensionality of the points themselves (2D, 3D, etc...).
+        :param scale: The scale of the points and the decision boundary. Defaults to 1.
+        :return: Function mapping a block size m to an m * i matrix of candidates.
+        """
+        k = len(axes)
+        lo, hi = np.full((1, k), -float(scale)), np.full((1, k), float(scale))
+        children = np.array(list(itertools.product([0, 1], repeat=k)))
+        kept_lo, kept_hi = [], []
+
+        for level in range(Benchmark.STRATA_DEPTH + 1):
+            center, half = (lo + hi) / 2, (hi - lo) / 2
+            d_min, d_max = distance_bounds(center, half)
+
+            # Cells whose points all pass are kept whole. Cells whose points all fail are dropped.
+            mixed = (d_max > gamma) & (d_min <= gamma)
+            kept_lo.append(lo[d_min > gamma]), kept_hi.append(hi[d_min > gamma])
+            lo, hi, half = lo[mixed], hi[mixed], half[mixed]
+
+            # Mixed cells on the last level (or past the cell budget) are kept whole as well.
+            if level == Benchmark.STRATA_DEPTH or len(lo) * len(children) > Benchmark.MAX_STRATA:
+                kept_lo.append(lo), kept_hi.append(hi)
+                break
+
+            # Split each mixed cell in two along each axis.
+            lo = (lo[:, None, :] + children[None, :, :] * half[:, None, :]).reshape(-1, k)
+            hi = lo + np.repeat(half, len(children), axis=0)
+
+        lo, hi = np.concatenate(kept_lo), np.concatenate(kept_hi)
+        if len(lo) == 0:
+            raise SamplingBudgetExceeded("No point lies farther than gamma = %g from the decision "
+                                         "boundary." % gamma)
+
+        area = np.prod(hi - lo, axis=1)
+        p = area / area.sum()
+
+        def propose(m):
+            cells = np.random.choice(len(lo), size=m, p=p)
+            x = Benchmark.random_matrix(m, i) * scale
+            x[:, axes] = lo[cells] + np.random.rand(m, k) * (hi - lo)[cells]
+            return x
+
+        return propose
+
+    @staticmethod
+    def __lipschitz_bounds(distance_to_b):
+        """ Bound the distance to a 2D decision boundary over square cells. A distance function 
+        changes by at most the distance moved, so over a cell it is within half the diagonal of its 
+        value at the center.
+
+        :param distance_to_b: Vectorized distance finding function of 2D points.
+        :return: Function mapping cell centers and half-widths to lower and upper bounds.
+        """
+        def bounds(center, half):
+            d_center, r = distance_to_b(center), np.hypot(half[:, 0], half[:, 1])
+            return d_center - r, d_center + r
+
+        return bounds
+
+    @staticmethod
+    def __over_budget(drawn, seconds):
+        """ Check the candidates drawn and time taken against the budget.
+
+        :param drawn: Number of candidates drawn so far.
+        :param seconds: Time spent sampling so far.
+        :return: True if either budget is exceeded.
+        """
+        return (Benchmark.MAX_CANDIDATES is not None and drawn >= Benchmark.MAX_CANDIDATES) or \
+               (Benchmark.MAX_SECONDS is not None and seconds >= Benchmark.MAX_SECONDS)
+
+    @staticmethod
+    def __report(stats):
+        """ Pass the statistics of a finished call to the hook, if one is defined.
+
+        :param stats: SamplingStats of the call.
+        :return: None.
+        """
+        Benchmark.HOOK is not None and Benchmark.HOOK(stats)
+
+    @staticmethod
+    def random_boundary(kind, i=2, degree=1, scale=1):
+        """ Draw the parameters of a random decision boundary, as used by the generate_* methods. 
+        These can be passed back to the generator as 'b' to fix its decision boundary.
+
+        :param kind: Generator the boundary is for: linear, polynomial, ellipse, or rectangle.
+        :param i: Dimensionality of the points themselves. Used for linear boundaries only.
+        :param degree: Degree of the polynomial. Used for polynomial boundaries only.
+        :param scale: The scale of the decision boundary. Defaults to 1.
+        :return: Vector of parameters describing the decision boundary.
+        """
+        if kind == "linear":
+            # w_star. w[0] = offset (fixed at the origin), w[1:] = normal of the hyperplane.
+            return np.append([0], (Benchmark.random_vector(i) * scale))
+        elif kind == "polynomial":
+            # b[0] = a in ax^3, b[1] = a in ax^2, ...
+            return np.append(Benchmark.random_vector(degree) * scale, [0])
+        elif kind == "ellipse":
+            # b[0], b[1] = ellipse center. b[2], b[3] = a, b terms.
+            return np.append([0, 0], np.abs(Benchmark.random_vector(2) * scale))
+        elif kind == "rectangle":
+            # b[0:1] = bottom left, b[2:3] = upper right.
+            return np.sort(Benchmark.random_vector(4))
+
+        raise ValueError("Unknown decision boundary: " + str(kind))
+
+    @staticmethod
+    def boundary_shape(kind, b, circle=False, scale=1):
+        """ Construct the decision boundary object returned by a generator from its parameters.
+
+        :param kind: Generator the boundary is for: linear, polynomial, ellipse, or rectangle.
+        :param b: Vector of parameters describing the decision boundary.
+        :param circle: Flag to define decision ellipse as a circle. Used for ellipses only.
+        :param scale: The scale of the decision boundary. Defaults to 1.
+        :return: The weight vector (linear), or the Shapely curve or shape (otherwise).
+        """
+        # Shapely is only imported once a shape is needed.
+        import shapely.affinity
+        from shapely.geometry import LineString, Point, Polygon
+
+        if kind == "linear":
+            return np.asarray(b)
+        elif kind == "polynomial":
+            return LineString(Benchmark.__polynomial_vertices(b, scale))
+        elif kind == "ellipse":
+            b_circle = Point(b[0], b[1]).buffer(1)
+            return b_circle if circle else shapely.affinity.scale(b_circle, b[2], b[3])
+        elif kind == "rectangle":
+            return Polygon([[b[0], b[1]], [b[0], b[3]], [b[2], b[3]], [b[2], b[1]]])
+
+        raise ValueError("Unknown decision boundary: " + str(kind))
+
+    @staticmethod
+    def __evaluate_polynomial(x, b):
+        """ Evaluate the polynomial decision boundary described by 'b' at each x.
+
+        :param x: Vector of x coordinates.
+        :param b: Vector of polynomial parameters. The degree is one less than its length.
+        :return: Vector of y coordinates of the decision boundary.
+        """
+        degree = len(b) - 1
+        return sum([(x * b[a]) ** (degree - a) for a in range(0, degree)])
+
+    @staticmethod
+    def __polynomial_vertices(b, scale=1):
+        """ Sample the polynomial decision boundary at 2 * GCP evenly spaced points.
+
+        :param b: Vector of polynomial parameters.
+        :param scale: The scale of the decision boundary. Defaults to 1.
+        :return: 2GCP x 2 matrix of vertices along the curve.
+        """
+        b_x = np.arange(-Benchmark.GCP, Benchmark.GCP) * (scale / Benchmark.GCP)
+        return np.column_stack([b_x, Benchmark.__evaluate_polynomial(b_x, b)])
+
+    @staticmethod
+    def generate_linear(n, gamma, i, scale=1, b=None, stats=None, constructive=False,
+                        dtype=np.float64, out=None, as_list=False):
         """ Generate a random list of points that meet the given criteria. Generate a random 
         hyperplane and classify the data using this decision boundary. Fix the curve at the origin.
 
@@ -58,25 +365,66 @@ class Benchmark(object):
         :param gamma: Minimum separation between the two "classes" of data in D.
         :param i: Dimensionality of the points themselves (2D, 3D, etc...).
         :param scale: The scale of the points and the classifying weight vector. Defaults to 1.
-        :return: n * i matrix of random points, a n-long vector of labels corresponding to the 
-                 first set of points, and the decision boundary weight vector.
+        :param b: Weight vector to classify with. If None, a random one is generated.
+        :param stats: SamplingStats to record this call in. The hook (if any) receives it either way.
+        :param constructive: If true, only draw candidates from the cells of the square that may 
+                             pass the gamma condition. Same distribution, far fewer rejections.
+        :param dtype: Type of the points: np.float64 (default) or np.float32 (half the memory).
+        :param out: n * i matrix (e.g. a np.memmap) to write the points into, or the path of a 
+                    .npy file to create as a memory-mapped matrix. If None, one is allocated.
+        :param as_list: If true, return the points and labels as lists (of vectors and ints).
+        :return: n * i matrix of random points, a n-long vector of int8 labels corresponding to 
+                 the first set of points, and the decision boundary weight vector.
         """
+        stats = (SamplingStats() if stats is None else stats).begin("linear", n, gamma)
         d_from_db = lambda x, w: np.abs(np.dot(x, w[1:]) + w[0]) / (len(w) - 1)
-        theta = lambda x, w: 1 if np.dot(w[1:], x) + w[0] > 0 else -1
+        theta = lambda x, w: np.where(np.dot(x, w[1:]) + w[0] > 0, 1, -1).astype(np.int8)
 
         # Generate our decision boundary (w_star). Scale appropriately.
-        w_star = np.append([0], (Benchmark.random_vector(i) * scale))
+        b = Benchmark.random_boundary("linear", i=i, scale=scale) if b is None else b
+        w_star = Benchmark.boundary_shape("linear", b)
+        stats.lap("boundary")
+
+        # Constructive mode splits along the two axes the distance varies with most. Over a cell, 
+        # w.x + w0 is within the sum of |w_j| * (half-width of the cell along axis j) of its center.
+        propose = None
+        if constructive:
+            w_abs = np.abs(w_star[1:])
+            axes = np.argsort(-w_abs, kind="stable")[:2]
+            rest = (w_abs.sum() - w_abs[axes].sum()) * scale
+
+            def bounds(center, half):
+                u, r = np.abs(np.dot(center, w_star[1:][axes]) + w_star[0]), np.dot(
+                    half, w_abs[axes]) + rest
+                return np.maximum(u - r, 0) / i, (u + r) / i
+
+            propose = Benchmark.__strata(gamma, bounds, axes, i, scale)
+
+        # Points are written straight into the given buffer, or a memory-mapped file.
+        if isinstance(out, str):
+            out = np.lib.format.open_memmap(out, mode="w+", dtype=dtype, shape=(n, i))
 
         # Generate our random points. Gamma condition must be met for each point added.
-        d = Benchmark.__d_passing_gamma(n, gamma, lambda a: d_from_db(a, w_star), i, scale)
+        d = Benchmark.__d_passing_gamma(n, gamma, lambda a: d_from_db(a, w_star), i, scale, stats,
+                                        propose, out, dtype)
+        stats.lap("sampling")
+
+        # We classify each point given w_star, one matrix-vector product per block of points. 
+        # Blocks bound the memory used by the products (and by float32 points cast for them).
+        ell, block = np.empty(n, np.int8), max(1, Benchmark.BLOCK_ELEMENTS // i)
+        for a in range(0, n, block):
+            ell[a:a + block] = theta(d[a:a + block], w_star)
+        stats.lap("labeling")
+        Benchmark.__report(stats)
 
-        # We classify each point given w_star. Perform for each point in D.
-        ell = [theta(x, w_star) for x in d]
+        if as_list:
+            return list(d), ell.tolist(), w_star
 
         return d, ell, w_star
 
     @staticmethod
-    def generate_polynomial(n, gamma, degree, scale=1):
+    def generate_polynomial(n, gamma, degree, scale=1, b=None, stats=None,
+                            constructive=False):
         """ Generate a random list of **2D** points that meet the given criteria and are able to 
         be classified by some polynomial of the given degree. Fix the points at the origin.
         
@@ -84,30 +432,44 @@ class Benchmark(object):
         :param gamma: Minimum separation between the two "classes" of data in D.
         :param degree: Degree of the polynomial that will classify the given points.
         :param scale: The scale of the points and the decision boundary. Defaults to 1.
+        :param b: Polynomial parameters to classify with. If None, random ones are generated.
+        :param stats: SamplingStats to record this call in. The hook (if any) receives it either way.
+        :param constructive: If true, only draw candidates from the cells of the square that may 
+                             pass the gamma condition. Same distribution, far fewer rejections.
         :return: n * 2 matrix of random points, a n-long vector of labels corresponding to the 
                  first set of points, and the decision boundary Shapely curve.
         """
-        d_from_db = lambda x, b_line: Point(x[0], x[1]).distance(b_line)
-        evaluate_p = lambda i, b_hat: sum([(i * b_hat[a]) ** (degree - a) for a in
-                                           range(0, degree)])
-        theta = lambda x, b_hat: 1 if evaluate_p(x[0], b_hat) < x[1] else -1
+        stats = (SamplingStats() if stats is None else stats).begin("polynomial", n, gamma)
+        theta = lambda x, b_hat: np.where(
+            Benchmark.__evaluate_polynomial(x[:, 0], b_hat) < x[:, 1], 1, -1)
 
         # Generate our decision boundary curve. b[0] = a in ax^3, b[1] = a in ax^2, ...
-        k = scale / Benchmark.GCP
-        b = np.append(Benchmark.random_vector(degree) * scale, [0])
-        b_curve = LineString([[i * k, evaluate_p(i * k, b)] for i in
-                              range(-Benchmark.GCP, Benchmark.GCP)])
+        b = Benchmark.random_boundary("polynomial", degree=degree, scale=scale) if b is None else b
+        b_vertices = Benchmark.__polynomial_vertices(b, scale)
+        b_curve = Benchmark.boundary_shape("polynomial", b, scale=scale)
+
+        # Index the curve once. Per-point cost no longer grows with the resolution GCP.
+        b_index = PolylineIndex(b_vertices)
+        stats.lap("boundary")
+
+        propose = constructive and Benchmark.__strata(
+            gamma, Benchmark.__lipschitz_bounds(b_index.distance), [0, 1], scale=scale) or None
 
         # Generate our random points. Gamma condition must be met for each point added.
-        d = Benchmark.__d_passing_gamma(n, gamma, lambda a: d_from_db(a, b_curve), scale=scale)
+        d = Benchmark.__d_passing_gamma(n, gamma, b_index.distance, scale=scale, stats=stats,
+                                        propose=propose)
+        stats.lap("sampling")
 
-        # We classify each point given decision boundary. Perform for each point in D.
-        ell = [theta(x, b) for x in d]
+        # We classify each point given decision boundary. Performed for all points in D at once.
+        ell = theta(d, b)
+        stats.lap("labeling")
+        Benchmark.__report(stats)
 
         return d, ell, b_curve
 
     @staticmethod
-    def generate_ellipse(n, gamma, circle=False, scale=1):
+    def generate_ellipse(n, gamma, circle=False, scale=1, b=None, stats=None,
+                         constructive=False):
         """ Generate a random list of **2D** points that meet the given criteria and are 
         classified by some ellipse. If desired, restrict the ellipse to just a circle.
         
@@ -115,47 +477,98 @@ class Benchmark(object):
         :param gamma: Minimum separation between the two "classes" of data in D.
         :param circle: Flag to define decision ellipse as a circle.
         :param scale: The scale of the points and the decision boundary. Defaults to 1.
+        :param b: Ellipse parameters to classify with. If None, random ones are generated.
+        :param stats: SamplingStats to record this call in. The hook (if any) receives it either way.
+        :param constructive: If true, only draw candidates from the cells of the square that may 
+                             pass the gamma condition. Same distribution, far fewer rejections.
         :return: n * 2 matrix of random points, a n-long vector of labels corresponding to the 
                  first set of points, and the decision ellipse Shapely shape.
         """
-        d_from_db = lambda x, b_shape: Point(x[0], x[1]).distance(b_shape.exterior)
-        theta = lambda x, b_shape: 1 if Point(x[0], x[1]).within(b_shape) else -1
+        stats = (SamplingStats() if stats is None else stats).begin("ellipse", n, gamma)
+        theta = lambda x, b_shape: np.where(b_shape.contains(x), 1, -1)
 
         # Generate our decision ellipse. b[0], b[1] = ellipse center. b[2], b[3] = a, b terms.
-        b = np.append([0, 0], np.abs(Benchmark.random_vector(2) * scale))
-        b_circle = Point(b[0], b[1]).buffer(1)
-        b_ellipse = b_circle if circle else shapely.affinity.scale(b_circle, b[2], b[3])
+        b = Benchmark.random_boundary("ellipse", scale=scale) if b is None else b
+        b_ellipse = Benchmark.boundary_shape("ellipse", b, circle)
+
+        # Distances and labels are found against the exact ellipse, for all points at once.
+        b_shape = Ellipse(1, 1, b[0:2]) if circle else Ellipse(b[2], b[3], b[0:2])
+        stats.lap("boundary")
+
+        propose = constructive and Benchmark.__strata(
+            gamma, Benchmark.__lipschitz_bounds(b_shape.distance), [0, 1], scale=scale) or None
 
         # Generate our random points. Gamma condition must be met for each point added.
-        d = Benchmark.__d_passing_gamma(n, gamma, lambda a: d_from_db(a, b_ellipse), scale=scale)
+        d = Benchmark.__d_passing_gamma(n, gamma, b_shape.distance, scale=scale, stats=stats,
+                                        propose=propose)
+        stats.lap("sampling")
 
-        # We classify each point given decision boundary. Perform for each point in D.
-        ell = [theta(x, b_ellipse) for x in d]
+        # We classify each point given decision boundary. Performed for all points in D at once.
+        ell = theta(d, b_shape)
+        stats.lap("labeling")
+        Benchmark.__report(stats)
 
         return d, ell, b_ellipse
 
     @staticmethod
-    def generate_rectangle(n, gamma, scale=1):
+    def generate_rectangle(n, gamma, scale=1, b=None, stats=None, constructive=False):
         """ Generate a random list of **2D** points that meet the given criteria and are 
         classified by some rectangle. 
         
         :param n: Number of points to generate. These are randomly plotted.
         :param gamma: Minimum separation between the two "classes" of data in D.
         :param scale: The scale of the points and the decision boundary. Defaults to 1.
+        :param b: Rectangle corners to classify with. If None, random ones are generated.
+        :param stats: SamplingStats to record this call in. The hook (if any) receives it either way.
+        :param constructive: If true, only draw candidates from the cells of the square that may 
+                             pass the gamma condition. Same distribution, far fewer rejections.
         :return: n * 2 matrix of random points, a n-long vector of labels corresponding to the 
                  first set of points, and the decision rectangle Shapely polygon.
         """
-        d_from_db = lambda x, b_shape: Point(x[0], x[1]).distance(b_shape.exterior)
-        theta = lambda x, b_shape: 1 if Point(x[0], x[1]).within(b_shape) else -1
+        stats = (SamplingStats() if stats is None else stats).begin("rectangle", n, gamma)
+        theta = lambda x, b_shape: np.where(b_shape.contains(x), 1, -1)
+
+        # Generate our decision rectangle. b[0:1] = bottom left, b[2:3] = upper right.
+        b = Benchmark.random_boundary("rectangle") if b is None else b
+        b_rectangle = Benchmark.boundary_shape("rectangle", b)
+
+        # Distances and labels are found in closed form, for all points at once.
+        b_shape = Rectangle(b[0], b[1], b[2], b[3])
+        stats.lap("boundary")
 
-        # Generate our decision rectangle. b[0:1] = upper right, b[2:3] = bottom left
-        b = sorted(Benchmark.random_vector(4))
-        b_rectangle = Polygon([[b[0], b[1]], [b[0], b[3]], [b[2], b[3]], [b[2], b[1]]])
+        propose = constructive and Benchmark.__strata(
+            gamma, Benchmark.__lipschitz_bounds(b_shape.distance), [0, 1], scale=scale) or None
 
         # Generate our random points. Gamma condition must be met for each point added.
-        d = Benchmark.__d_passing_gamma(n, gamma, lambda a: d_from_db(a, b_rectangle), scale=scale)
+        d = Benchmark.__d_passing_gamma(n, gamma, b_shape.distance, scale=scale, stats=stats,
+                                        propose=propose)
+        stats.lap("sampling")
 
-        # We classify each point given decision boundary. Perform for each point in D.
-        ell = [theta(x, b_rectangle) for x in d]
+        # We classify each point given decision boundary. Performed for all points in D at once.
+        ell = theta(d, b_shape)
+        stats.lap("labeling")
+        Benchmark.__report(stats)
 
         return d, ell, b_rectangle
+
+    @staticmethod
+    def stream(kind, n, gamma, chunk_size=2 ** 16, b=None, **params):
+        """ Generate a data-set of n points in chunks of at most chunk_size points, all classified 
+        by the same decision boundary. Only one chunk is held at a time. Restoring the state of the 
+        global random stream (np.random.get_state) before a call replays the same chunks.
+
+        :param kind: Generator to use: linear, polynomial, ellipse, or rectangle.
+        :param n: Total number of points to generate.
+        :param gamma: Minimum separation between the two "classes" of data in D.
+        :param chunk_size: Number of points in each chunk (the last one may be smaller).
+        :param b: Decision boundary parameters. If None, a random boundary is drawn first.
+        :param params: Remaining arguments to the generator (i, degree, circle, scale, ...).
+        :return: Iterator over (points, labels) pairs of each chunk.
+        """
+        generator = getattr(Benchmark, "generate_" + kind)
+        if b is None:
+            b = Benchmark.random_boundary(kind, **{a: params[a] for a in ("i", "degree", "scale")
+                                                   if a in params})
+
+        for a in range(0, n, chunk_size):
+            yield generator(min(chunk_size, n - a), gamma, b=b, **params)[0:2]
@@ -0,0 +1,148 @@
+""""
+Filename:    cache.py
+
+Description: This file contains an on-disk cache of generated training data. Data-sets are keyed
+             by a hash of the generator, its parameters and the seed used, and stored as .npy
+             files that are loaded back memory-mapped. The least recently used data-sets are
+             evicted once the cache grows past its size limit.
+"""""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from benchmark import Benchmark
+
+
+class DatasetCache(object):
+    """ Methods: generate = Generate a data-set through Benchmark, or load it if already cached.
+                 key = Hash identifying a data-set.
+                 clear = Remove every data-set from the cache.
+    """
+
+    # Files stored for each data-set: points, labels, and decision boundary parameters.
+    FILES = ("d.npy", "ell.npy", "b.npy")
+
+    # Generator arguments that change the data-set drawn. Others (e.g. stats) are not hashed.
+    KEY_PARAMS = ("i", "degree", "circle", "scale", "constructive", "dtype")
+
+    def __init__(self, path, max_bytes=2 ** 30, mmap=True):
+        """ Open (or create) the cache in the given directory.
+
+        :param path: Directory to store data-sets in.
+        :param max_bytes: Size the cache is trimmed to after each new data-set is stored.
+        :param mmap: If false, load data-sets fully into memory instead of memory-mapping them.
+        """
+        self.path, self.max_bytes, self.mmap = path, max_bytes, mmap
+        self.hits, self.misses = 0, 0
+
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(kind, n, gamma, seed, **params):
+        """ Hash the parameters identifying a data-set.
+
+        :param kind: Generator to use: linear, polynomial, ellipse, or rectangle.
+        :param n: Number of points to generate.
+        :param gamma: Minimum separation between the two "classes" of data in D.
+        :param seed: Seed of the random stream the data-set is drawn from.
+        :param params: Remaining arguments to the generator. Only those in KEY_PARAMS are hashed.
+        :return: Hex digest identifying the data-set.
+        """
+        spec = {a: params[a] for a in DatasetCache.KEY_PARAMS if a in params}
+        spec.update(kind=kind, n=int(n), gamma=float(gamma), seed=seed)
+        "dtype" in spec and spec.update(dtype=np.dtype(spec["dtype"]).name)
+
+        # NumPy scalars (e.g. n taken from np.arange) are hashed as the equal Python numbers.
+        return hashlib.sha256(json.dumps(spec, sort_keys=True, default=lambda o: o.tolist())
+                              .encode()).hexdigest()
+
+    def generate(self, kind, n, gamma, seed, **params):
+        """ Produce the data-set that Benchmark.generate_<kind> returns after seeding the global
+        random stream with 'seed'. If the data-set is cached, it is loaded from disk. Otherwise,
+        it is generated (reseeding the global stream) and stored.
+
+        :param kind: Generator to use: linear, polynomial, ellipse, or rectangle.
+        :param n: Number of points to generate.
+        :param gamma: Minimum separation between the two "classes" of data in D.
+        :param seed: Seed of the random stream the data-set is drawn from.
+        :param params: Remaining arguments to the generator (i, degree, circle, scale).
+        :return: Points, labels, and decision boundary, as returned by the generator.
+        """
+        entry = os.path.join(self.path, DatasetCache.key(kind, n, gamma, seed, **params))
+
+        if os.path.isdir(entry):
+            self.hits += 1
+            os.utime(entry)
+
+            mmap_mode = "r" if self.mmap else None
+            d, ell, b = [np.load(os.path.join(entry, f), mmap_mode) for f in DatasetCache.FILES]
+        else:
+            self.misses += 1
+            np.random.seed(seed)
+
+            # Draw the boundary ourselves (as the generator would) so that it can be stored.
+            b = Benchmark.random_boundary(kind, **{a: params[a] for a in ("i", "degree", "scale")
+                                                   if a in params})
+            d, ell = getattr(Benchmark, "generate_" + kind)(n, gamma, b=b, **params)[0:2]
+
+            self.__store(entry, d, ell, b)
+
+        b_shape = Benchmark.boundary_shape(kind, np.asarray(b), params.get("circle", False),
+                                           params.get("scale", 1))
+        return d, ell, b_shape
+
+    def __store(self, entry, d, ell, b):
+        """ Write a data-set to the cache, then evict the least recently used data-sets until the
+        cache fits in its size limit. Files are written to a temporary directory first, so
+        concurrent readers never see a partial data-set.
+
+        :param entry: Directory of the data-set.
+        :param d: Points of the data-set.
+        :param ell: Labels of the data-set.
+        :param b: Decision boundary parameters of the data-set.
+        """
+        staging = tempfile.mkdtemp(dir=self.path, prefix=".")
+        for f, a in zip(DatasetCache.FILES, [d, ell, b]):
+            np.save(os.path.join(staging, f), np.asarray(a))
+
+        try:
+            os.rename(staging, entry)
+        except OSError:
+            # Another process stored the same data-set first.
+            shutil.rmtree(staging, ignore_errors=True)
+
+        self.__evict(keep=entry)
+
+    def __evict(self, keep):
+        """ Remove the least recently used data-sets until the cache fits in its size limit.
+
+        :param keep: Data-set to never evict (the one just stored).
+        :return: None.
+        """
+        entries = []
+        for e in os.scandir(self.path):
+            if e.is_dir() and not e.name.startswith("."):
+                size = sum(f.stat().st_size for f in os.scandir(e.path))
+                entries.append((e.stat().st_mtime, size, e.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path != keep:
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+
+    def clear(self):
+        """ Remove every data-set from the cache, and reset the hit and miss counters.
+
+        :return: None.
+        """
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path, exist_ok=True)
+        self.hits, self.misses = 0, 0
@@ -0,0 +1,178 @@
+""""
+Filename:    cli.py
+
+Description: This file contains a command line entry point to generate data-sets, run sweeps and
+             trials, and plot data-sets, configured from a JSON file. Each command reads its own
+             section of the file ({"generate": {...}, "sweep": {...}, ...}), and single values can
+             be overridden with --set. Heavy libraries are only imported by the commands that use
+             them, and plots are drawn with the Agg backend when no display is present.
+
+             python cli.py generate -c config.json --set n=1000 --set out=data.npz
+             python cli.py sweep -c config.json
+             python cli.py trial -c config.json
+             python cli.py plot --set data=data.npz --set out=data.png
+"""""
+
+import argparse
+import csv
+import json
+import sys
+
+import numpy as np
+
+# Parameters of Benchmark.random_boundary, taken from the parameters of a generator.
+BOUNDARY_PARAMS = ("i", "degree", "scale")
+
+
+def generate(kind="polynomial", n=100, gamma=0.01, seed=0, out="data.npz", params=None,
+             cache=None):
+    """ Generate a data-set, and save its points, labels, and boundary parameters.
+
+    :param kind: Generator to use: linear, polynomial, ellipse, or rectangle.
+    :param n: Number of points to generate.
+    :param gamma: Minimum separation between the two "classes" of data in D.
+    :param seed: Seed of the global random stream.
+    :param out: File (.npz) to save the data-set to.
+    :param params: Dictionary of the remaining arguments to the generator (i, degree, ...).
+    :param cache: Directory of a DatasetCache to load the data-set from (or store it in).
+    :return: None.
+    """
+    from benchmark import Benchmark
+
+    params = {} if params is None else params
+    np.random.seed(seed)
+
+    # Draw the boundary ourselves (as the generator, or the cache, would) so that it can be saved.
+    b = Benchmark.random_boundary(kind, **{a: params[a] for a in BOUNDARY_PARAMS if a in params})
+    if cache is None:
+        d, ell = getattr(Benchmark, "generate_" + kind)(n, gamma, b=b, **params)[0:2]
+    else:
+        from cache import DatasetCache
+        d, ell = DatasetCache(cache).generate(kind, n, gamma, seed, **params)[0:2]
+
+    np.savez(out, d=d, ell=ell, b=b, kind=kind, params=json.dumps(params))
+    print("%s: %d points (%d positive) -> %s" % (kind, len(d), int(np.sum(ell == 1)), out))
+
+
+def sweep(adaptive=False, **config):
+    """ Run a sweep of the errors over n: datacollector, or adaptive_sweep if adaptive. The results
+    are written to standard output as CSV. The excel export of datacollector is off unless
+    xlsx = true is set.
+
+    :param adaptive: If true, run adaptive.adaptive_sweep. Otherwise, DataCollector.datacollector.
+    :param config: Arguments to the sweep function.
+    :return: None.
+    """
+    writer = csv.writer(sys.stdout)
+
+    if adaptive:
+        from adaptive import adaptive_sweep
+
+        config["configs"] = [tuple(a) for a in config.get("configs", [])]
+        writer.writerow(["n", "kernel", "C", "mean_errors", "half_width", "iterations", "status"])
+        writer.writerows(adaptive_sweep(**config))
+    else:
+        from DataCollector import datacollector
+
+        config.setdefault("xlsx", False)
+        writer.writerow(["n", "average_errors"])
+        writer.writerows(datacollector(**config))
+
+
+def trial(trial="cm", gamma=0.01, n=100, c=(1.0,), kernel="rbf", seed=0, gram=False,
+          out="trial.csv"):
+    """ Run a trial (trial_cm or trial_pd) for each complexity penalty, on one set of data-sets.
+
+    :param trial: Trial to run: cm (confusion matrices) or pd (distances).
+    :param gamma: Minimum distance between the points and decision boundary.
+    :param n: Number of data.
+    :param c: List of complexity penalties.
+    :param kernel: Kernel function to use. There exists: linear, poly, rbf, and sigmoid.
+    :param seed: Seed of the global random stream.
+    :param gram: If true, share kernel matrices between the fits through a GramCache.
+    :param out: File to log the trial to.
+    :return: None.
+    """
+    from kernels import GramCache
+    from trial import trial_cm, trial_datasets, trial_pd
+
+    np.random.seed(seed)
+    datasets, cache = trial_datasets(gamma, n), GramCache() if gram else None
+
+    with open(out, "w") as f:
+        for c_i in c:
+            (trial_cm if trial == "cm" else trial_pd)(f, gamma, n, c_i, kernel, cache, datasets)
+
+
+def plot(data="data.npz", out="data.png", kernel=None, show=False):
+    """ Plot a data-set saved by generate, along with its decision boundary. If a kernel is given,
+    an SVC is fit to the data-set and its classifying curve is drawn as well.
+
+    :param data: File (.npz) of the data-set.
+    :param out: File to save the figure to. If None, it is not saved.
+    :param kernel: Kernel function of the SVC to plot. If None, no classifier is plotted.
+    :param show: If true, show the figure (requires a display).
+    :return: None.
+    """
+    from benchmark import Benchmark
+    from visualize import Visualize, pyplot
+
+    saved = np.load(data)
+    kind, params = str(saved["kind"]), json.loads(str(saved["params"]))
+    d, ell = saved["d"], saved["ell"]
+    b_shape = Benchmark.boundary_shape(kind, saved["b"], params.get("circle", False),
+                                       params.get("scale", 1))
+
+    # The classifying curve is drawn under the points.
+    if kernel is not None:
+        from sklearn import svm
+        Visualize.plot_clf(d, svm.SVC(kernel=kernel).fit(d, ell))
+
+    Visualize.plot_2d(d, ell, b_shape, scale=params.get("scale", 1))
+    out is not None and pyplot().savefig(out)
+    show and pyplot().show()
+
+
+# Functions run by each command.
+COMMANDS = {"generate": generate, "sweep": sweep, "trial": trial, "plot": plot}
+
+
+def parse_value(value):
+    """ Parse the value of a --set override as JSON, falling back to a string.
+
+    :param value: Text of the value.
+    :return: Parsed value.
+    """
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def main(argv=None):
+    """ Parse the command line, and run the chosen command with its configuration.
+
+    :param argv: Arguments to parse. If None, those of the process are used.
+    :return: None.
+    """
+    parser = argparse.ArgumentParser(description="Generate, sweep, trial and plot SVM data-sets.")
+    parser.add_argument("command", choices=sorted(COMMANDS), help="Command to run.")
+    parser.add_argument("-c", "--config", help="JSON file with a section for each command.")
+    parser.add_argument("-s", "--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a value of the command's section (parsed as JSON).")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.config is not None:
+        with open(args.config) as f:
+            config = json.load(f).get(args.command, {})
+
+    for a in args.set:
+        key, _, value = a.partition("=")
+        config[key] = parse_value(value)
+
+    COMMANDS[args.command](**config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+""""
+Filename:    evaluation.py
+
+Description: This file contains array-based evaluation of classifiers. Training and testing splits
+             are selected with index arrays and masks, each classifier is queried with a single
+             batched call, and the confusion matrix is counted in one pass over the labels.
+"""""
+
+from collections import namedtuple
+
+import numpy as np
+
+
+class Confusion(namedtuple("Confusion", ["tp", "fp", "tn", "fn"])):
+    """ Confusion matrix of a classifier, for the labels 1 (positive) and -1 (negative). """
+    __slots__ = ()
+
+    @property
+    def errors(self):
+        """ Total number of misclassified points (false positives and false negatives). """
+        return self.fp + self.fn
+
+
+# Result of evaluating a classifier: its confusion matrix, predicted labels, and (if requested)
+# the value of its decision function for each point.
+Evaluation = namedtuple("Evaluation", ["confusion", "predicted", "decision"])
+
+
+def confusion_counts(actual, predicted):
+    """ Count the confusion matrix of the predicted labels against the actual labels.
+
+    :param actual: Vector of actual labels (1 or -1).
+    :param predicted: Vector of predicted labels (1 or -1).
+    :return: Confusion matrix as (tp, fp, tn, fn).
+    """
+    actual, predicted = np.asarray(actual) == 1, np.asarray(predicted) == 1
+
+    # Encode each (predicted, actual) pair as 0..3 and count all pairs at once.
+    tn, fn, fp, tp = np.bincount(2 * predicted + actual, minlength=4)
+    return Confusion(int(tp), int(fp), int(tn), int(fn))
+
+
+def split_halves(n):
+    """ Split a data-set in two. The first half is used for training, the latter for testing.
+
+    :param n: Number of points in the data-set.
+    :return: Boolean masks selecting the training and testing points.
+    """
+    training = np.arange(n) < int(n / 2)
+    return training, ~training
+
+
+def restricted_training_indices(ell, restriction):
+    """ Select the restricted training data used by "auxillary.confusion_test": the first point,
+    the first point of the opposite label, then the remaining points up to the restriction.
+
+    :param ell: Labels of the data-set.
+    :param restriction: Values from 0-1 specify what percentage of the data-set to train with.
+    :return: Indices of the training points, in the order they are passed to the classifier.
+    """
+    ell = np.asarray(ell)
+    limit = int(restriction * len(ell))
+    rest = np.arange(1, limit)
+
+    # Always include one point of each label, if both exist.
+    opposite = np.flatnonzero(ell[0] * ell < 0)
+    if len(opposite) == 0:
+        return rest
+
+    return np.concatenate([[0, opposite[0]], rest[rest != opposite[0]]])
+
+
+def evaluate(clf, d, ell, decision=False):
+    """ Evaluate a fitted classifier on the given points with one batched call per query.
+
+    :param clf: Fitted classifying object (SVC).
+    :param d: Matrix of points to evaluate on.
+    :param ell: Labels of the points in d.
+    :param decision: If true, also compute the decision function of each point.
+    :return: Evaluation holding the confusion matrix, predicted labels, and decision values.
+    """
+    predicted = clf.predict(d)
+    return Evaluation(confusion_counts(ell, predicted), predicted,
+                      clf.decision_function(d) if decision else None)
@@ -0,0 +1,178 @@
+""""
+Filename:    geometry.py
+
+Description: This file contains array-based geometry used by the training data generators. Each
+             method operates on an entire m x 2 matrix of points at once, in place of building a
+             Shapely object for each point.
+"""""
+
+import numpy as np
+
+
+class PolylineIndex(object):
+    """ Spatial index over the segments of a polyline. Answers batched distance queries by
+    looking up the nearest vertices in a KD-tree, then refining exactly against the segments
+    adjacent to those vertices. The result matches the distance to the full polyline.
+    """
+
+    # Number of nearest vertices to refine against on the first pass.
+    K = 8
+
+    # Vertices per KD-tree leaf. Unbalanced, non-compact trees are far faster for points on a curve.
+    LEAF_SIZE = 64
+
+    def __init__(self, vertices):
+        """ Build the index over the given polyline.
+
+        :param vertices: m x 2 matrix of the vertices of the polyline, in order.
+        """
+        self.v = np.ascontiguousarray(vertices, dtype=float)
+        self.a, self.ab = self.v[:-1], np.diff(self.v, axis=0)
+
+        # Any point on a segment lies within half a segment length of one of its endpoints.
+        self.ab_2 = np.einsum('ij,ij->i', self.ab, self.ab)
+        self.reach = 0.5 * np.sqrt(self.ab_2.max()) if len(self.ab) > 0 else 0
+
+        # SciPy is only imported once a curve is indexed.
+        from scipy.spatial import cKDTree
+
+        self.tree = cKDTree(self.v, leafsize=PolylineIndex.LEAF_SIZE, compact_nodes=False,
+                            balanced_tree=False)
+
+    def __segment_distance(self, p, s):
+        """ Find the distance of each point to each of its candidate segments.
+
+        :param p: m x 2 matrix of points.
+        :param s: m x k matrix of segment indices to check for each point.
+        :return: m x k matrix of distances.
+        """
+        ap = p[:, np.newaxis, :] - self.a[s]
+        ab, ab_2 = self.ab[s], self.ab_2[s]
+
+        # Project onto each segment, clamping to its endpoints. Degenerate segments clamp to 'a'.
+        t = np.einsum('ijk,ijk->ij', ap, ab) / np.where(ab_2 > 0, ab_2, 1)
+        t = np.clip(t, 0, 1)
+
+        return np.linalg.norm(ap - t[:, :, np.newaxis] * ab, axis=2)
+
+    def distance(self, p):
+        """ Find the distance of each point to the polyline.
+
+        :param p: m x 2 matrix of points.
+        :return: m-long vector of distances.
+        """
+        p = np.asarray(p, dtype=float)
+        if len(self.ab) == 0:
+            return np.linalg.norm(p - self.v[0], axis=1)
+
+        delta, todo, k = np.empty(len(p)), np.arange(len(p)), PolylineIndex.K
+        while len(todo) > 0:
+            k = min(k, len(self.v))
+            r, j = self.tree.query(p[todo], k=np.arange(1, k + 1))
+
+            # Candidate segments are those on either side of each of the nearest vertices.
+            s = np.clip(np.concatenate([j - 1, j], axis=1), 0, len(self.ab) - 1)
+            best = self.__segment_distance(p[todo], s).min(axis=1)
+
+            # The nearest segment has been seen if no unseen vertex is close enough to be its end.
+            resolved = (k == len(self.v)) | (r[:, -1] > np.sqrt(best ** 2 + self.reach ** 2))
+            delta[todo[resolved]] = best[resolved]
+            todo, k = todo[~resolved], 2 * k
+
+        return delta
+
+
+class Ellipse(object):
+    """ Axis-aligned ellipse. Distances to the boundary are found with a fixed number of
+    closest-point iterations, run on all points at once.
+    """
+
+    # Closest-point iterations. Enough to reach float precision for very eccentric ellipses.
+    ITERATIONS = 16
+
+    def __init__(self, a, b, center=(0, 0)):
+        """ Define the ellipse (x / a)^2 + (y / b)^2 = 1, about the given center.
+
+        :param a: Semi-axis along x.
+        :param b: Semi-axis along y.
+        :param center: Center of the ellipse.
+        """
+        self.a, self.b, self.center = float(a), float(b), np.asarray(center, dtype=float)
+
+    def contains(self, p):
+        """ Determine which points lie strictly inside of the ellipse.
+
+        :param p: m x 2 matrix of points.
+        :return: m-long boolean vector.
+        """
+        q = np.asarray(p, dtype=float) - self.center
+        return (q[:, 0] / self.a) ** 2 + (q[:, 1] / self.b) ** 2 < 1
+
+    def distance(self, p):
+        """ Find the distance of each point to the boundary of the ellipse. Each point is folded
+        into the first quadrant, and the parameter of its closest point is refined by stepping
+        along the evolute of the ellipse.
+
+        :param p: m x 2 matrix of points.
+        :return: m-long vector of distances.
+        """
+        q = np.abs(np.asarray(p, dtype=float) - self.center)
+        a, b = self.a, self.b
+        t_x, t_y = np.full(len(q), np.sqrt(0.5)), np.full(len(q), np.sqrt(0.5))
+
+        for _ in range(Ellipse.ITERATIONS):
+            # Center of curvature (on the evolute) for the current closest point estimate.
+            e_x, e_y = (a ** 2 - b ** 2) * t_x ** 3 / a, (b ** 2 - a ** 2) * t_y ** 3 / b
+            r = np.hypot(a * t_x - e_x, b * t_y - e_y)
+            s_x, s_y = q[:, 0] - e_x, q[:, 1] - e_y
+            s = np.maximum(np.hypot(s_x, s_y), np.finfo(float).tiny)
+
+            # Move the estimate along the ray from the evolute through the point. At the center of 
+            # a circle every point of the boundary is closest, so the estimate is kept.
+            u_x = np.clip((s_x * r / s + e_x) / a, 0, 1)
+            u_y = np.clip((s_y * r / s + e_y) / b, 0, 1)
+            t = np.hypot(u_x, u_y)
+            moved, t = t > 0, np.where(t > 0, t, 1)
+            t_x, t_y = np.where(moved, u_x / t, t_x), np.where(moved, u_y / t, t_y)
+
+        return np.hypot(q[:, 0] - a * t_x, q[:, 1] - b * t_y)
+
+
+class Rectangle(object):
+    """ Axis-aligned rectangle. Containment and distances to the boundary are closed-form. """
+
+    def __init__(self, x_0, y_0, x_1, y_1):
+        """ Define the rectangle [x_0, x_1] * [y_0, y_1].
+
+        :param x_0: Left edge.
+        :param y_0: Bottom edge.
+        :param x_1: Right edge.
+        :param y_1: Top edge.
+        """
+        self.x_0, self.y_0, self.x_1, self.y_1 = float(x_0), float(y_0), float(x_1), float(y_1)
+
+    def contains(self, p):
+        """ Determine which points lie strictly inside of the rectangle.
+
+        :param p: m x 2 matrix of points.
+        :return: m-long boolean vector.
+        """
+        p = np.asarray(p, dtype=float)
+        return (self.x_0 < p[:, 0]) & (p[:, 0] < self.x_1) & \
+               (self.y_0 < p[:, 1]) & (p[:, 1] < self.y_1)
+
+    def distance(self, p):
+        """ Find the distance of each point to the boundary of the rectangle.
+
+        :param p: m x 2 matrix of points.
+        :return: m-long vector of distances.
+        """
+        p = np.asarray(p, dtype=float)
+
+        # Signed distance along each axis. Negative inside of the rectangle's extent.
+        d_x = np.maximum(self.x_0 - p[:, 0], p[:, 0] - self.x_1)
+        d_y = np.maximum(self.y_0 - p[:, 1], p[:, 1] - self.y_1)
+
+        # Outside: distance to the nearest edge or corner. Inside: distance to the nearest edge.
+        outside = np.hypot(np.maximum(d_x, 0), np.maximum(d_y, 0))
+        return np.where((d_x < 0) & (d_y < 0), -np.maximum(d_x, d_y), outside)
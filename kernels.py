@@ -0,0 +1,196 @@
+""""
+Filename:    kernels.py
+
+Description: This file contains a cache of kernel (Gram) matrices. A sweep over the complexity
+             penalty C fits the same data-set with the same kernel many times; computing the Gram
+             matrix once and fitting with kernel="precomputed" avoids recomputing it in each fit.
+"""""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+class GramCache(object):
+    """ Methods: train = Gram matrix of a set of points against itself.
+                 cross = Kernel matrix of a set of points against the training points.
+                 fit = Fit an SVC through the cache.
+    """
+
+    # Parameters used by each of SVC's kernels.
+    KERNEL_PARAMS = {"linear": (), "poly": ("gamma", "degree", "coef0"), "rbf": ("gamma",),
+                     "sigmoid": ("gamma", "coef0")}
+
+    def __init__(self, max_bytes=2 ** 30, float32=False):
+        """ Create an empty cache.
+
+        :param max_bytes: Memory budget. The least recently used matrices are evicted past this.
+        :param float32: If true, store matrices in single precision (half the memory).
+        """
+        self.max_bytes, self.dtype = max_bytes, np.float32 if float32 else np.float64
+        self.matrices, self.nbytes = OrderedDict(), 0
+        self.hits, self.misses = 0, 0
+
+    @staticmethod
+    def fingerprint(x):
+        """ Hash the contents of a matrix of points.
+
+        :param x: Matrix of points.
+        :return: Hex digest identifying the matrix.
+        """
+        x = np.ascontiguousarray(x, dtype=float)
+        return hashlib.sha1(x.tobytes() + str(x.shape).encode()).hexdigest()
+
+    @staticmethod
+    def params(x, kernel, gamma="scale", degree=3, coef0=0.0):
+        """ Resolve the kernel parameters exactly as SVC does for the given training points.
+
+        :param x: Matrix of training points.
+        :param kernel: Kernel function to use. There exists: linear, poly, rbf, and sigmoid.
+        :param gamma: Kernel coefficient. "scale", "auto", or a number (as in SVC).
+        :param degree: Degree of the polynomial kernel.
+        :param coef0: Independent term of the polynomial and sigmoid kernels.
+        :return: Dictionary of the parameters used by the kernel.
+        """
+        x = np.asarray(x, dtype=float)
+        if gamma == "scale":
+            gamma = 1.0 / (x.shape[1] * x.var()) if x.var() != 0 else 1.0
+        elif gamma == "auto":
+            gamma = 1.0 / x.shape[1]
+
+        p = {"gamma": float(gamma), "degree": degree, "coef0": coef0}
+        return {a: p[a] for a in GramCache.KERNEL_PARAMS[kernel]}
+
+    @staticmethod
+    def kernel(y, x, kernel, params):
+        """ Compute the kernel matrix K(y, x). Integer powers of the polynomial kernel are taken by
+        repeated multiplication, which is several times faster than a floating point power.
+
+        :param y: Matrix of points for the rows.
+        :param x: Matrix of points for the columns.
+        :param kernel: Kernel function to use.
+        :param params: Resolved parameters of the kernel.
+        :return: Kernel matrix of size len(y) x len(x).
+        """
+        if kernel != "poly" or int(params["degree"]) != params["degree"] or params["degree"] < 1:
+            from sklearn.metrics.pairwise import pairwise_kernels
+            return pairwise_kernels(y, x, metric=kernel, **params)
+
+        base = params["gamma"] * np.dot(np.asarray(y, dtype=float), np.asarray(x, dtype=float).T)
+        base += params["coef0"]
+
+        k = base.copy()
+        for _ in range(int(params["degree"]) - 1):
+            k *= base
+
+        return k
+
+    def __lookup(self, y, x, kernel, params):
+        """ Find the kernel matrix K(y, x), computing and storing it if it is not yet cached.
+
+        :param y: Matrix of points for the rows.
+        :param x: Matrix of (training) points for the columns.
+        :param kernel: Kernel function to use.
+        :param params: Resolved parameters of the kernel.
+        :return: Kernel matrix of size len(y) x len(x).
+        """
+        key = (GramCache.fingerprint(y), GramCache.fingerprint(x), kernel,
+               tuple(sorted(params.items())))
+
+        if key in self.matrices:
+            self.hits += 1
+            self.matrices.move_to_end(key)
+            return self.matrices[key]
+
+        self.misses += 1
+        k = GramCache.kernel(y, x, kernel, params).astype(self.dtype, copy=False)
+
+        # Evict the least recently used matrices until the new one fits in the budget.
+        while self.matrices and self.nbytes + k.nbytes > self.max_bytes:
+            self.nbytes -= self.matrices.popitem(last=False)[1].nbytes
+
+        if k.nbytes <= self.max_bytes:
+            self.matrices[key], self.nbytes = k, self.nbytes + k.nbytes
+
+        return k
+
+    def train(self, x, kernel, **params):
+        """ Find the Gram matrix of the training points.
+
+        :param x: Matrix of training points.
+        :param kernel: Kernel function to use. There exists: linear, poly, rbf, and sigmoid.
+        :param params: Kernel parameters, as passed to SVC (gamma, degree, coef0).
+        :return: Gram matrix of size len(x) x len(x).
+        """
+        return self.__lookup(x, x, kernel, GramCache.params(x, kernel, **params))
+
+    def cross(self, y, x, kernel, **params):
+        """ Find the kernel matrix of the given points against the training points.
+
+        :param y: Matrix of points to predict.
+        :param x: Matrix of training points.
+        :param kernel: Kernel function to use. There exists: linear, poly, rbf, and sigmoid.
+        :param params: Kernel parameters, as passed to SVC (gamma, degree, coef0).
+        :return: Kernel matrix of size len(y) x len(x).
+        """
+        return self.__lookup(y, x, kernel, GramCache.params(x, kernel, **params))
+
+    def fit(self, x, ell, kernel, c=1.0, **params):
+        """ Fit an SVC to the training points, using the cached Gram matrix.
+
+        :param x: Matrix of training points.
+        :param ell: Labels of the training points.
+        :param kernel: Kernel function to use. There exists: linear, poly, rbf, and sigmoid.
+        :param c: Complexity penalty.
+        :param params: Kernel parameters, as passed to SVC (gamma, degree, coef0).
+        :return: Fitted classifier, which predicts through the cache.
+        """
+        return PrecomputedSVC(self, x, kernel, params).fit(ell, c)
+
+
+class PrecomputedSVC(object):
+    """ SVC fitted on a precomputed Gram matrix. Points given to predict and decision_function are
+    mapped to their kernel matrix against the training points through the cache.
+    """
+
+    def __init__(self, cache, x, kernel, params):
+        """ Bind the classifier to its training points and kernel.
+
+        :param cache: GramCache to draw kernel matrices from.
+        :param x: Matrix of training points.
+        :param kernel: Kernel function to use.
+        :param params: Kernel parameters, as passed to SVC (gamma, degree, coef0).
+        """
+        self.cache, self.x, self.kernel, self.params = cache, np.asarray(x), kernel, params
+        self.clf = None
+
+    def fit(self, ell, c=1.0):
+        """ Fit the classifier to the training points.
+
+        :param ell: Labels of the training points.
+        :param c: Complexity penalty.
+        :return: This classifier.
+        """
+        from sklearn import svm
+
+        self.clf = svm.SVC(C=c, kernel="precomputed")
+        self.clf.fit(self.cache.train(self.x, self.kernel, **self.params), ell)
+
+        return self
+
+    def predict(self, y):
+        """ Predict the labels of the given points.
+
+        :param y: Matrix of points.
+        :return: Vector of predicted labels.
+        """
+        return self.clf.predict(self.cache.cross(y, self.x, self.kernel, **self.params))
+
+    def decision_function(self, y):
+        """ Find the value of the decision function at each of the given points.
+
+        :param y: Matrix of points.
+        :return: Vector of decision function values.
+        """
+        return self.clf.decision_function(self.cache.cross(y, self.x, self.kernel, **self.params))
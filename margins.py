@@ -0,0 +1,92 @@
+""""
+Filename:    margins.py
+
+Description: This file contains margin analytics for fitted classifiers. Functional margins are
+             taken from the decision values with NumPy masks, and geometric margins from the support
+             vectors and dual coefficients (the norm of w in the kernel's feature space). Sweeps of
+             the margin over the number of points run through the sweep executor, so they can be
+             spread over a pool of processes.
+"""""
+
+import numpy as np
+
+from benchmark import Benchmark
+from kernels import GramCache
+from sweep import run_sweep
+
+
+def functional_margin(distances):
+    """ Find half the gap between the smallest positive and largest non-positive decision values. A
+    side without any values counts as 0.
+
+    :param distances: Vector of decision function values.
+    :return: Functional margin of the classifier over the given values.
+    """
+    distances = np.asarray(distances, dtype=float)
+    above, below = distances[distances > 0], distances[distances <= 0]
+
+    d_p = above.min() if len(above) != 0 else 0
+    d_m = below.max() if len(below) != 0 else 0
+    return abs(0.5 * (d_p - d_m))
+
+
+def geometric_margin(clf, x):
+    """ Find the geometric margin 1 / ||w|| of a fitted SVC, where w is the weight vector in the
+    feature space of its kernel: ||w||^2 = a^T K a, for the dual coefficients a and the kernel
+    matrix K of the support vectors.
+
+    :param clf: Fitted two-class SVC, with a linear, poly, rbf or sigmoid kernel.
+    :param x: Matrix of the points the classifier was trained on (to resolve gamma as SVC does).
+    :return: Geometric margin of the classifier.
+    """
+    a, v = clf.dual_coef_[0], clf.support_vectors_
+    params = GramCache.params(x, clf.kernel, clf.gamma, clf.degree, clf.coef0)
+
+    # The norm can come out (slightly) negative for kernels that are not positive definite.
+    w_norm = np.sqrt(max(float(np.dot(a, np.dot(GramCache.kernel(v, v, clf.kernel, params), a))),
+                         0))
+    return 1 / w_norm if w_norm > 0 else np.inf
+
+
+def margin_cell(n, gamma, degree, kernel, svc_params):
+    """ Generate a polynomial data-set of n points (redrawn until it holds both labels), fit an SVC
+    to it, and find its margins.
+
+    :param n: Number of data points.
+    :param gamma: Minimum separation between the two "classes" of data.
+    :param degree: Degree of the polynomial decision boundary.
+    :param kernel: Kernel function of the SVC.
+    :param svc_params: Dictionary of the remaining parameters of the SVC (gamma, C, degree, ...).
+    :return: Functional and geometric margin of the classifier.
+    """
+    d, ell = Benchmark.generate_polynomial(n, gamma, degree)[0:2]
+    while len(np.unique(ell)) < 2:
+        d, ell = Benchmark.generate_polynomial(n, gamma, degree)[0:2]
+
+    from sklearn import svm
+
+    clf = svm.SVC(kernel=kernel, **svc_params).fit(d, ell)
+    return functional_margin(clf.decision_function(d)), geometric_margin(clf, d)
+
+
+def margin_sweep(gamma, degree, n_start, n_end, kernel="sigmoid", svc_params=None, seed=None,
+                 workers=1, chunksize=1):
+    """ Find the margins of an SVC fitted to a new polynomial data-set for each n in
+    range(n_start, n_end). Each n is a cell of the sweep, with its own random stream.
+
+    :param gamma: Minimum separation between the two "classes" of data.
+    :param degree: Degree of the polynomial decision boundary.
+    :param n_start: Starting point for number of data points.
+    :param n_end: Ending point for number of data points.
+    :param kernel: Kernel function of the SVC.
+    :param svc_params: Dictionary of the remaining parameters of the SVC. Defaults to gamma = 3.
+    :param seed: Master seed of the sweep.
+    :param workers: Number of processes to spread the cells over.
+    :param chunksize: Number of cells sent to a worker at once.
+    :return: List of [n, functional margin, geometric margin].
+    """
+    svc_params = {"gamma": 3} if svc_params is None else svc_params
+    cells = [((n,), (n, gamma, degree, kernel, svc_params)) for n in range(n_start, n_end)]
+
+    return [[key[0], f, g] for (key, _), (f, g) in
+            zip(cells, run_sweep(margin_cell, cells, seed, workers, chunksize))]
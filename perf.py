@@ -0,0 +1,176 @@
+""""
+Filename:    perf.py
+
+Description: This file contains a performance benchmark suite for the hot paths of this project:
+             training data generation, classifier evaluation, margins, and (headless) plotting.
+             Timings are written to JSON along with the environment they were taken in, and can
+             be compared against a stored baseline to flag regressions.
+
+             python perf.py run -o current.json [--quick]
+             python perf.py compare baseline.json current.json [--threshold 0.25]
+"""""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+from sklearn import svm
+
+from auxillary import calculate_margin, confusion_test
+from benchmark import Benchmark
+from visualize import Visualize
+
+# Parameter grids. The quick grid is meant for a fast check before a full run.
+GRIDS = {"full": {"n": [100, 1000, 10000, 100000], "gamma": [0.001, 0.01, 0.1],
+                  "degree": [1, 2, 4], "i": [2, 10, 100]},
+         "quick": {"n": [100, 1000], "gamma": [0.01], "degree": [2], "i": [2]}}
+
+
+def environment():
+    """ Describe the environment the benchmarks are run in.
+
+    :return: Dictionary of the interpreter, platform, and library versions.
+    """
+    import shapely
+    import sklearn
+
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "processor": platform.processor(), "cpus": os.cpu_count(),
+            "numpy": np.__version__, "sklearn": sklearn.__version__,
+            "shapely": shapely.__version__, "matplotlib": matplotlib.__version__,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def measure(f, repeat, seed=0):
+    """ Time the function 'f' over several runs. Each run is seeded identically.
+
+    :param f: Function of no arguments to time.
+    :param repeat: Number of runs.
+    :param seed: Seed of the global random stream, set before each run.
+    :return: Dictionary of the minimum and median run time, in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        np.random.seed(seed)
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+
+    return {"min": min(times), "median": float(np.median(times)), "repeat": repeat}
+
+
+def cases(grid):
+    """ Build the benchmark cases for the given grid.
+
+    :param grid: Dictionary of the values of n, gamma, degree, and i to benchmark.
+    :return: List of (name, function) pairs.
+    """
+    c = []
+    for n in grid["n"]:
+        for gamma in grid["gamma"]:
+            for i in grid["i"]:
+                c.append(("generate_linear n=%d gamma=%g i=%d" % (n, gamma, i),
+                          lambda n=n, gamma=gamma, i=i: Benchmark.generate_linear(n, gamma, i)))
+            for degree in grid["degree"]:
+                c.append(("generate_polynomial n=%d gamma=%g degree=%d" % (n, gamma, degree),
+                          lambda n=n, gamma=gamma, degree=degree:
+                          Benchmark.generate_polynomial(n, gamma, degree)))
+            c.append(("generate_ellipse n=%d gamma=%g" % (n, gamma),
+                      lambda n=n, gamma=gamma: Benchmark.generate_ellipse(n, gamma)))
+            c.append(("generate_rectangle n=%d gamma=%g" % (n, gamma),
+                      lambda n=n, gamma=gamma: Benchmark.generate_rectangle(n, gamma)))
+
+    # Evaluation and plotting are benchmarked on fixed data-sets, up to a size SVC handles quickly.
+    for n in [a for a in grid["n"] if a <= 10000]:
+        np.random.seed(0)
+        d, ell, b = Benchmark.generate_polynomial(n, 0.01, 2)
+        clf = svm.SVC().fit(d, ell)
+        distances = clf.decision_function(d)
+
+        c.append(("confusion_test n=%d" % n,
+                  lambda d=d, ell=ell: confusion_test((d, ell), 0.5, "rbf")))
+        c.append(("calculate_margin n=%d" % n, lambda a=distances: calculate_margin(a)))
+        c.append(("plot_2d n=%d" % n, lambda d=d, ell=ell, b=b: (plt.figure(), Visualize.plot_2d(
+            d, ell, b), plt.gcf().canvas.draw(), plt.close())))
+        c.append(("plot_clf n=%d" % n, lambda d=d, clf=clf: (plt.figure(), Visualize.plot_clf(
+            d, clf), plt.gcf().canvas.draw(), plt.close())))
+
+    return c
+
+
+def run(out, quick=False, repeat=3, match=None):
+    """ Run the benchmark suite, and write the results to JSON.
+
+    :param out: File to write the results to.
+    :param quick: If true, run on the quick grid.
+    :param repeat: Number of runs of each case.
+    :param match: If defined, only run cases whose name contains this string.
+    :return: Dictionary of the results.
+    """
+    results = {}
+    for name, f in cases(GRIDS["quick" if quick else "full"]):
+        if match is None or match in name:
+            results[name] = measure(f, repeat)
+            print("%-50s %10.4fs" % (name, results[name]["median"]))
+
+    report = {"environment": environment(), "results": results}
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    return report
+
+
+def compare(baseline, current, threshold=0.25):
+    """ Compare two sets of results. A case regresses if its median time grew by more than the
+    threshold (as a fraction of the baseline).
+
+    :param baseline: File of the baseline results.
+    :param current: File of the current results.
+    :param threshold: Allowed slowdown, e.g. 0.25 = 25% slower.
+    :return: List of the names of the cases that regressed.
+    """
+    with open(baseline) as f:
+        b = json.load(f)["results"]
+    with open(current) as f:
+        c = json.load(f)["results"]
+
+    regressions = []
+    for name in sorted(set(b) & set(c)):
+        ratio = c[name]["median"] / max(b[name]["median"], 1e-9)
+        flag = ratio > 1 + threshold
+        flag and regressions.append(name)
+        print("%-50s %10.4fs %10.4fs %7.2fx%s" % (name, b[name]["median"], c[name]["median"],
+                                                  ratio, "  REGRESSION" if flag else ""))
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Performance benchmark suite.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p_run = commands.add_parser("run", help="Run the benchmark suite.")
+    p_run.add_argument("-o", "--out", default="perf.json", help="File to write the results to.")
+    p_run.add_argument("--quick", action="store_true", help="Run on the quick grid.")
+    p_run.add_argument("--repeat", type=int, default=3, help="Number of runs of each case.")
+    p_run.add_argument("-k", "--match", help="Only run cases whose name contains this string.")
+
+    p_compare = commands.add_parser("compare", help="Flag regressions against a baseline.")
+    p_compare.add_argument("baseline", help="File of the baseline results.")
+    p_compare.add_argument("current", help="File of the current results.")
+    p_compare.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown.")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args.out, args.quick, args.repeat, args.match)
+    else:
+        sys.exit(1 if compare(args.baseline, args.current, args.threshold) else 0)
@@ -0,0 +1,127 @@
+""""
+Filename:    results.py
+
+Description: This file contains a streaming sink for the results of a sweep. Each finished cell is
+             appended to a CSV log as soon as it is reported (flushed in small batches, or after a
+             few seconds), so that an interrupted sweep keeps its progress and can skip the cells
+             already recorded when it is restarted. The log starts with the parameters of its sweep,
+             so that it is never resumed by a sweep with different parameters.
+"""""
+
+import csv
+import json
+import os
+import time
+
+
+class ResultSink(object):
+    """ Methods: append = Record a finished cell.
+                 flush = Write the buffered records to disk.
+                 completed = Keys of the cells already recorded.
+    """
+
+    # Columns of the log. Each row is one (n, iteration) cell.
+    FIELDS = ("n", "iteration", "errors", "seconds")
+
+    # Prefix of the first line of the log, which holds the parameters of the sweep (as JSON).
+    PARAMS = "# params: "
+
+    def __init__(self, path, params=None, flush_every=32, flush_seconds=30.0):
+        """ Open the log at the given path, loading any records already in it.
+
+        :param path: File to append records to. Created if it does not exist.
+        :param params: Dictionary of the parameters of the sweep. An existing log must have been
+                       written with the same parameters.
+        :param flush_every: Number of records to buffer before writing them to disk.
+        :param flush_seconds: Seconds after which buffered records are written on the next append.
+        """
+        self.path, self.flush_every, self.flush_seconds = path, flush_every, flush_seconds
+        self.buffer, self.last_flush = [], time.monotonic()
+        self.params = json.loads(json.dumps({} if params is None else params, sort_keys=True))
+
+        saved, rows = ResultSink.__recover(path)
+        if saved is not None and saved != self.params:
+            raise ValueError("Log %s was written by a sweep with different parameters: %s (not %s)"
+                             % (path, saved, self.params))
+        self.records = {(int(r[0]), int(r[1])): float(r[2]) for r in rows}
+
+        new = saved is None
+        self.f = open(path, "a", newline="")
+        self.writer = csv.writer(self.f)
+
+        if new:
+            self.f.write(ResultSink.PARAMS + json.dumps(self.params, sort_keys=True) + "\n")
+            self.writer.writerow(ResultSink.FIELDS)
+            self.f.flush()
+
+    @staticmethod
+    def __recover(path):
+        """ Read the records in a log. A partially written last line (from a crash) is dropped
+        from the file, so that new records start on a line of their own.
+
+        :param path: File to read.
+        :return: Parameters of the sweep (None for an empty log), and the list of complete rows.
+        """
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None, []
+
+        with open(path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+                data = data[:data.rfind(b"\n") + 1]
+
+        lines = data.decode().splitlines()
+        if not lines or not lines[0].startswith(ResultSink.PARAMS):
+            raise ValueError("Log %s does not record the parameters of its sweep." % path)
+
+        rows = list(csv.reader(lines[2:]))
+        return json.loads(lines[0][len(ResultSink.PARAMS):]), [r for r in rows if
+                                                                len(r) == len(ResultSink.FIELDS)]
+
+    def completed(self):
+        """ Find the cells already recorded in the log.
+
+        :return: Set of (n, iteration) keys.
+        """
+        return set(self.records)
+
+    def append(self, n, iteration, errors, seconds):
+        """ Record a finished cell. The record is written once the buffer fills, once
+        flush_seconds have passed since the last write, or on flush.
+
+        :param n: Number of data points of the cell.
+        :param iteration: Iteration of the cell.
+        :param errors: Number of errors counted in the cell.
+        :param seconds: Time taken to run the cell.
+        :return: None.
+        """
+        self.records[(n, iteration)] = errors
+        self.buffer.append((n, iteration, errors, seconds))
+
+        full = len(self.buffer) >= self.flush_every
+        (full or time.monotonic() - self.last_flush >= self.flush_seconds) and self.flush()
+
+    def flush(self):
+        """ Write the buffered records to disk.
+
+        :return: None.
+        """
+        self.writer.writerows(self.buffer)
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.buffer, self.last_flush = [], time.monotonic()
+
+    def close(self):
+        """ Flush the buffered records and close the log.
+
+        :return: None.
+        """
+        self.flush()
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,136 @@
+""""
+Filename:    streaming.py
+
+Description: This file contains an out-of-core alternative to training an SVC on a whole data-set.
+             Data-sets are generated in chunks about a fixed decision boundary, a linear SVM
+             (SGDClassifier with the hinge loss) is trained on the chunks with partial_fit, and the
+             errors are counted chunk by chunk. Memory is bounded by the chunk size, so the error
+             can be studied out to millions of points.
+"""""
+
+import itertools
+import math
+
+import numpy as np
+
+from benchmark import Benchmark
+from evaluation import evaluate
+
+# Number of boundaries drawn, in search of a data-set holding both labels, before giving up.
+MAX_BOUNDARIES = 100
+
+
+class HomogeneousPolynomialFeatures(object):
+    """ Exact feature map of the kernel (gamma * <x, y>)^degree, i.e. SVC's poly kernel with
+    coef0 = 0. Each feature is a monomial of exactly the given degree, scaled by the square root of
+    gamma^degree times its multinomial coefficient, so that <phi(x), phi(y)> is the kernel.
+    """
+
+    def __init__(self, gamma=3, degree=3):
+        self.gamma, self.degree = gamma, degree
+
+    def fit(self, x):
+        """ Find the monomials (as tuples of coordinate indices) and their scales.
+
+        :param x: Matrix of points. Only its number of columns is used.
+        :return: The fitted feature map.
+        """
+        self.monomials_ = np.array(list(itertools.combinations_with_replacement(
+            range(np.shape(x)[1]), self.degree)), dtype=int).reshape(-1, self.degree)
+        counts = [np.bincount(m).tolist() for m in self.monomials_]
+        self.scales_ = np.sqrt([self.gamma ** self.degree * math.factorial(self.degree) /
+                                np.prod([math.factorial(c) for c in k]) for k in counts])
+        return self
+
+    def transform(self, x):
+        """ Map points to the feature space of the kernel.
+
+        :param x: Matrix of points.
+        :return: Matrix of the features of each point.
+        """
+        return np.prod(np.asarray(x, dtype=float)[:, self.monomials_], axis=2) * self.scales_
+
+
+def feature_map(kernel_type):
+    """ Build the explicit feature map standing in for SVC's kernel (as configured in
+    "auxillary.confusion_test": gamma = 3, coef0 = 0, and the default degree of 3). The poly map is
+    exact, and the RBF map is a random approximation.
+
+    :param kernel_type: Kernel to stand in for. There exists: linear, poly, and rbf.
+    :return: Unfitted scikit-learn transformer, or None for the linear kernel.
+    """
+    if kernel_type == "poly":
+        return HomogeneousPolynomialFeatures(gamma=3, degree=3)
+    elif kernel_type == "rbf":
+        from sklearn.kernel_approximation import RBFSampler
+        return RBFSampler(gamma=3, n_components=512, random_state=0)
+    elif kernel_type == "linear":
+        return None
+
+    raise ValueError("Kernel not supported by the streaming learner: " + str(kernel_type))
+
+
+def stream_errors(n, gamma, restriction, kernel_type="linear", kind="polynomial",
+                  chunk_size=2 ** 16, epochs=5, **params):
+    """ Train a linear SVM on a streamed data-set and count its errors. As with
+    "auxillary.confusion_test", the classifier is trained on the first points of the data-set (up to
+    the restriction, plus the first point of the opposite label) and tested on all of it. The
+    data-set is never held in memory: each pass replays the same chunks from a saved state of the
+    global random stream.
+
+    :param n: Number of data points.
+    :param gamma: Minimum separation between the two "classes" of data.
+    :param restriction: Values from 0-1 specify what percentage of the data-set to train with.
+    :param kernel_type: Feature map to train in. There exists: linear, poly, and rbf.
+    :param kind: Generator to stream from: linear, polynomial, ellipse, or rectangle.
+    :param chunk_size: Number of points generated (and held) at once.
+    :param epochs: Number of passes over the training points.
+    :param params: Remaining arguments to the generator (i, degree, circle, scale, ...).
+    :return: Number of errors over the whole data-set.
+    :raises RuntimeError: If no data-set with both labels is drawn in MAX_BOUNDARIES boundaries.
+    """
+    features, prefix = feature_map(kernel_type), max(int(restriction * n), 1)
+
+    # Draw one boundary for every pass. As in the SVC path, redraw it until the data-set holds both
+    # labels, and find its first point of the opposite label to the first point.
+    for _ in range(MAX_BOUNDARIES):
+        b = Benchmark.random_boundary(kind, **{a: params[a] for a in ("i", "degree", "scale")
+                                               if a in params})
+        state, a, first, opposite = np.random.get_state(), 0, None, None
+        for d, ell in Benchmark.stream(kind, n, gamma, chunk_size, b, **params):
+            first = ell[0] if first is None else first
+            k = np.flatnonzero(ell != first)
+            if len(k) > 0:
+                opposite = (d[k[:1]], ell[k[:1]], a + k[0])
+                break
+            a += len(ell)
+        if opposite is not None:
+            break
+    else:
+        raise RuntimeError("No data-set with both labels in %d boundaries drawn." % MAX_BOUNDARIES)
+
+    # Feature maps only depend on the dimensionality of the points.
+    phi = (lambda x: x) if features is None else features.fit(d[:1]).transform
+
+    # Train on the points "evaluation.restricted_training_indices" selects: the first 'prefix'
+    # points, and the first point of the opposite label (held on to, if it lies past them).
+    from sklearn.linear_model import SGDClassifier
+
+    clf = SGDClassifier(loss="hinge", random_state=0)
+    for _ in range(epochs):
+        np.random.set_state(state)
+        for a, (d, ell) in zip(range(0, prefix, chunk_size),
+                               Benchmark.stream(kind, n, gamma, chunk_size, b, **params)):
+            d, ell = d[:prefix - a], ell[:prefix - a]
+            if a == 0 and opposite[2] >= prefix:
+                d, ell = np.vstack([d[:1], opposite[0], d[1:]]), np.concatenate(
+                    [ell[:1], opposite[1], ell[1:]])
+            clf.partial_fit(phi(d), ell, classes=[-1, 1])
+
+    # Replay the whole data-set, and count the errors of each chunk.
+    np.random.set_state(state)
+    errors = 0
+    for d, ell in Benchmark.stream(kind, n, gamma, chunk_size, b, **params):
+        errors += evaluate(clf, phi(d), ell).confusion.errors
+
+    return errors
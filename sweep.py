@@ -0,0 +1,61 @@
+""""
+Filename:    sweep.py
+
+Description: This file contains a sweep executor. Each cell of a sweep is run with its own random
+             stream, derived from a master seed and the cell's key, so that a sweep returns the
+             same results whether it is run serially or spread over a pool of processes.
+"""""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def cell_seed(seed, key):
+    """ Derive the random state of a single cell from the master seed of the sweep.
+
+    :param seed: Master seed of the sweep.
+    :param key: Tuple of non-negative integers identifying the cell, e.g. (n, iteration).
+    :return: Seed to pass to "np.random.seed".
+    """
+    return np.random.SeedSequence([seed] + list(key)).generate_state(4)
+
+
+def run_cell(task):
+    """ Seed the global random stream for the given cell, then run it. Generators in Benchmark draw
+    from the global stream, so this fixes the data used by the cell.
+
+    :param task: Tuple of the cell function, master seed, cell key, and arguments to the function.
+    :return: Result of the cell function.
+    """
+    f, seed, key, args = task
+    np.random.seed(cell_seed(seed, key))
+
+    return f(*args)
+
+
+def run_sweep(f, cells, seed=None, workers=1, chunksize=1, executor=None):
+    """ Run the function 'f' for each cell of a sweep. Results are yielded in the order of 'cells'.
+
+    :param f: Module-level function to run for each cell. Must be picklable if workers > 1.
+    :param cells: List of (key, args) pairs. The key identifies the cell and seeds its stream.
+    :param seed: Master seed of the sweep. If None, a fresh seed is drawn from the OS.
+    :param workers: Number of processes to run cells in. If 1, cells are run in this process.
+    :param chunksize: Number of cells to send to a worker at once.
+    :param executor: Pool to run cells in, in place of workers. Lets several sweeps share one pool
+                     (and the start-up cost of its processes).
+    :return: Generator over the result of each cell.
+    """
+    seed = np.random.SeedSequence().entropy if seed is None else seed
+    tasks = [(f, seed, key, args) for key, args in cells]
+
+    if executor is not None:
+        for r in executor.map(run_cell, tasks, chunksize=chunksize):
+            yield r
+    elif workers == 1:
+        for task in tasks:
+            yield run_cell(task)
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            for r in executor.map(run_cell, tasks, chunksize=chunksize):
+                yield r
@@ -0,0 +1,60 @@
+""""
+Filename:    test_benchmark.py
+
+Description: This file checks that constructive sampling draws from the same distribution as
+             rejection sampling, for each generator.
+"""""
+
+import numpy as np
+import pytest
+from scipy.stats import ks_2samp
+
+from benchmark import Benchmark, SamplingBudgetExceeded
+
+# Generator, arguments, and fixed boundary of each case.
+CASES = [("linear", {"i": 2}, [0, 0.6, -0.8]),
+         ("linear", {"i": 4}, [0, 0.9, -0.2, 0.1, 0.4]),
+         ("polynomial", {"degree": 3}, [0.5, -0.9, 0.7, 0]),
+         ("ellipse", {}, [0.1, -0.1, 0.3, 0.7]),
+         ("ellipse", {"circle": True}, [0, 0, 0.3, 0.7]),
+         ("rectangle", {}, [-0.5, -0.2, 0.3, 0.6])]
+
+
+@pytest.mark.parametrize("kind, params, b", CASES)
+@pytest.mark.parametrize("gamma", [0.05, 0.3])
+def test_constructive_matches_rejection(kind, params, b, gamma):
+    generator, n = getattr(Benchmark, "generate_" + kind), 4000
+
+    np.random.seed(0)
+    d_0, ell_0 = generator(n, gamma, b=np.asarray(b, dtype=float), **params)[0:2]
+    np.random.seed(1)
+    d_1, ell_1 = generator(n, gamma, b=np.asarray(b, dtype=float), constructive=True,
+                           **params)[0:2]
+
+    # Each coordinate has the same distribution, and the labels the same proportions.
+    for a in range(d_0.shape[1]):
+        assert ks_2samp(d_0[:, a], d_1[:, a]).pvalue > 1e-3
+    assert abs(np.mean(ell_0 == 1) - np.mean(ell_1 == 1)) < 0.04
+
+
+def test_constructive_raises_when_no_point_passes():
+    with pytest.raises(SamplingBudgetExceeded):
+        Benchmark.generate_ellipse(10, 1.3, b=np.array([0, 0, 0.2, 0.2]), constructive=True)
+    with pytest.raises(SamplingBudgetExceeded):
+        Benchmark.generate_linear(10, 1.1, 2, b=np.array([0, 1, 1.0]), constructive=True)
+
+
+@pytest.mark.parametrize("generate", [lambda: Benchmark.generate_rectangle(100000, 0.0),
+                                      lambda: Benchmark.generate_ellipse(5000, 0.6)])
+def test_candidate_budget_is_never_exceeded(monkeypatch, generate):
+    reported = []
+    monkeypatch.setattr(Benchmark, "MAX_CANDIDATES", 1000)
+    monkeypatch.setattr(Benchmark, "HOOK", reported.append)
+
+    np.random.seed(0)
+    with pytest.raises(SamplingBudgetExceeded) as e:
+        generate()
+
+    # The failed call is still reported, with its sampling time charged.
+    assert e.value.stats.candidates == 1000 and e.value.stats.sampling_seconds > 0
+    assert reported == [e.value.stats]
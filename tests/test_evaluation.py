@@ -0,0 +1,58 @@
+""""
+Filename:    test_evaluation.py
+
+Description: This file checks the array-based evaluation against the list-building loop and the
+             scikit-learn confusion matrix it replaced in "auxillary.confusion_test".
+"""""
+
+import numpy as np
+import pytest
+from sklearn.metrics import confusion_matrix
+
+from evaluation import confusion_counts, restricted_training_indices
+
+
+def baseline_training_indices(ell, restriction):
+    """ Indices of the training points selected by the original loop of confusion_test. """
+    indices, chk = [], 0
+    for i in range(len(ell)):
+        if ell[0] * ell[i] < 0:
+            indices += [0, i]
+            chk = i
+            break
+    data_limit = int(restriction * len(ell))
+    for i in range(1, data_limit):
+        if i != chk:
+            indices.append(i)
+    return indices
+
+
+@pytest.mark.parametrize("ell, restriction", [
+    ([1, 1, -1, 1, -1, -1, 1, 1], 0.5),    # Opposite label within the limit.
+    ([1, 1, 1, 1, 1, 1, -1, 1], 0.5),      # Opposite label beyond the limit.
+    ([-1, -1, -1, -1], 0.75),              # No opposite label.
+    ([1, -1, 1], 0.3),                     # No points past the first within the limit.
+    ([-1, 1, 1, -1, 1], 1.0)])
+def test_training_indices_match_baseline(ell, restriction):
+    expected = baseline_training_indices(ell, restriction)
+    np.testing.assert_array_equal(restricted_training_indices(ell, restriction), expected)
+
+
+def test_training_indices_match_baseline_at_random():
+    rng = np.random.RandomState(0)
+    for _ in range(200):
+        ell = np.where(rng.rand(rng.randint(1, 40)) < rng.rand(), 1, -1)
+        restriction = rng.rand()
+        np.testing.assert_array_equal(restricted_training_indices(ell, restriction),
+                                      baseline_training_indices(ell, restriction))
+
+
+def test_confusion_counts_match_sklearn():
+    rng = np.random.RandomState(1)
+    for m in [1, 2, 50, 1000]:
+        actual, predicted = rng.choice([-1, 1], m), rng.choice([-1, 1], m)
+        (tn, fp), (fn, tp) = confusion_matrix(actual, predicted, labels=[-1, 1])
+
+        counts = confusion_counts(actual, predicted)
+        assert counts == (tp, fp, tn, fn)
+        assert counts.errors == fp + fn
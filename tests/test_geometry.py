@@ -0,0 +1,55 @@
+""""
+Filename:    test_geometry.py
+
+Description: This file checks the array-based geometry used by the generators against the Shapely
+             objects it replaced (or, for the ellipse, a dense polygonal reference).
+"""""
+
+import numpy as np
+import shapely
+from shapely.geometry import LineString, Polygon
+
+from geometry import Ellipse, PolylineIndex, Rectangle
+
+
+def random_points(m, seed=0, scale=1.5):
+    """ Draw m points uniformly from the square [-scale, scale]^2. """
+    return scale * (2 * np.random.RandomState(seed).rand(m, 2) - 1)
+
+
+def test_rectangle_matches_shapely():
+    p, x_0, y_0, x_1, y_1 = random_points(5000), -0.4, -0.2, 0.3, 0.6
+    polygon = Polygon([[x_0, y_0], [x_0, y_1], [x_1, y_1], [x_1, y_0]])
+    rectangle = Rectangle(x_0, y_0, x_1, y_1)
+
+    expected = shapely.distance(shapely.points(p), polygon.exterior)
+    np.testing.assert_allclose(rectangle.distance(p), expected, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(rectangle.contains(p), shapely.within(shapely.points(p), polygon))
+
+
+def test_ellipse_matches_dense_reference():
+    p = random_points(2000)
+    for a, b in [(0.3, 0.8), (1.0, 1.0), (0.9, 0.05)]:
+        t = np.linspace(0, 2 * np.pi, 20001)
+        reference = LineString(np.column_stack([0.1 + a * np.cos(t), -0.2 + b * np.sin(t)]))
+        ellipse = Ellipse(a, b, (0.1, -0.2))
+
+        expected = shapely.distance(shapely.points(p), reference)
+        np.testing.assert_allclose(ellipse.distance(p), expected, rtol=0, atol=1e-6)
+
+        q = (p - [0.1, -0.2]) / [a, b]
+        np.testing.assert_array_equal(ellipse.contains(p), np.hypot(q[:, 0], q[:, 1]) < 1)
+
+
+def test_circle_distance_at_center():
+    np.testing.assert_allclose(Ellipse(0.2, 0.2).distance(np.zeros((1, 2))), [0.2])
+
+
+def test_polyline_matches_shapely():
+    p = random_points(5000)
+    x = np.linspace(-1, 1, 2000)
+    for vertices in [np.column_stack([x, 0.8 * x ** 3 - 0.3 * x]),
+                     np.cumsum(0.05 * (2 * np.random.RandomState(1).rand(500, 2) - 1), axis=0)]:
+        expected = shapely.distance(shapely.points(p), LineString(vertices))
+        np.testing.assert_allclose(PolylineIndex(vertices).distance(p), expected, rtol=0,
+                                   atol=1e-12)
@@ -0,0 +1,50 @@
+""""
+Filename:    test_results.py
+
+Description: This file checks that sweep logs recover their records after an interruption, and that
+             resumed sweeps skip the cells already recorded.
+"""""
+
+import pytest
+
+import DataCollector
+from DataCollector import datacollector
+from results import ResultSink
+
+PARAMS = {"gamma": 0.05, "kernel_type": "linear"}
+
+
+def test_recover_drops_partial_last_line(tmp_path):
+    log = str(tmp_path / "log.csv")
+    with ResultSink(log, PARAMS) as sink:
+        sink.append(10, 0, 2.0, 0.1)
+        sink.append(10, 1, 3.0, 0.1)
+
+    # Cut off the last record halfway, as a crash during a write would.
+    with open(log, "rb+") as f:
+        f.truncate(len(f.read()) - 4)
+
+    with ResultSink(log, PARAMS) as sink:
+        assert sink.records == {(10, 0): 2.0}
+        sink.append(10, 1, 4.0, 0.1)
+    assert ResultSink(log, PARAMS).records == {(10, 0): 2.0, (10, 1): 4.0}
+
+
+def test_different_parameters_are_refused(tmp_path):
+    log = str(tmp_path / "log.csv")
+    ResultSink(log, PARAMS).close()
+
+    with pytest.raises(ValueError):
+        ResultSink(log, dict(PARAMS, gamma=0.1))
+
+
+def test_resumed_sweep_reruns_no_cell(tmp_path, monkeypatch):
+    log, args = str(tmp_path / "log.csv"), (10, 13, 2, 0.05, 0.5, "linear")
+    first = datacollector(*args, seed=3, log=log, xlsx=False)
+
+    # Every cell is in the log, so the second sweep has none to run.
+    ran, run_sweep = [], DataCollector.run_sweep
+    monkeypatch.setattr(DataCollector, "run_sweep",
+                        lambda f, cells, *a: ran.extend(cells) or run_sweep(f, cells, *a))
+    assert datacollector(*args, seed=3, log=log, xlsx=False) == first
+    assert ran == []
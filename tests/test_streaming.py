@@ -0,0 +1,33 @@
+""""
+Filename:    test_streaming.py
+
+Description: This file checks the streaming learner: its explicit feature maps reproduce the SVC
+             kernels they stand in for, and it selects its training points as the SVC path does.
+"""""
+
+import numpy as np
+import pytest
+from sklearn.metrics.pairwise import polynomial_kernel
+
+from streaming import feature_map, stream_errors
+
+
+@pytest.mark.parametrize("dim", [1, 2, 5])
+def test_poly_map_matches_svc_kernel(dim):
+    x, y = np.random.RandomState(dim).randn(2, 60, dim)
+    phi = feature_map("poly").fit(x[:1]).transform
+
+    # SVC(kernel="poly", gamma=3) as in auxillary.confusion_test: coef0 = 0, degree = 3.
+    expected = polynomial_kernel(x, y, degree=3, gamma=3, coef0=0)
+    np.testing.assert_allclose(np.dot(phi(x), phi(y).T), expected, rtol=1e-10, atol=1e-8)
+
+
+def test_small_restriction_trains_on_both_labels():
+    # With int(0.5 * 3) = 1 training point, the first point of the opposite label is added to it.
+    np.random.seed(0)
+    assert 0 <= stream_errors(3, 0.05, 0.5, degree=1) <= 3
+
+
+def test_one_sided_data_sets_give_up():
+    with pytest.raises(RuntimeError):
+        stream_errors(1, 0.05, 0.5, degree=1)
@@ -0,0 +1,30 @@
+""""
+Filename:    test_sweep.py
+
+Description: This file checks that sweeps spread over a pool of processes give exactly the results
+             of the serial sweep with the same seed, and that adaptive sweeps score every
+             configuration on the same data-sets.
+"""""
+
+import pytest
+
+from DataCollector import datacollector
+from adaptive import adaptive_sweep
+
+
+@pytest.mark.parametrize("nested", [False, True])
+def test_parallel_sweep_matches_serial(nested):
+    args = (10, 14, 3, 0.05, 0.5, "linear")
+
+    serial = datacollector(*args, seed=7, nested=nested, xlsx=False)
+    parallel = datacollector(*args, seed=7, workers=2, chunksize=2, nested=nested, xlsx=False)
+    assert parallel == serial
+
+
+def test_adaptive_sweep_does_not_depend_on_config_order():
+    configs, args = [("linear", 1.0), ("rbf", 1.0), ("rbf", 10.0)], ([20, 25], 0.05, 0.5)
+
+    # Fits are seeded by (n, iteration), so each configuration sees the same data-sets either way.
+    rows = adaptive_sweep(*args, configs, max_iterations=4, eta=1, seed=3)
+    reordered = adaptive_sweep(*args, configs[::-1], max_iterations=4, eta=1, seed=3)
+    assert sorted(rows) == sorted(reordered)
@@ -13,10 +13,45 @@ Description: This file contains sets of trials to characterize SK-Learn's Suppor
              point from the decision boundary and the classifier into the CSV.
 """""
 
-from sklearn import svm
+import numpy as np
 
+from benchmark import Benchmark
+from evaluation import evaluate, split_halves
 
-def trial_pd(f, gamma, n, c, phi):
+
+def trial_datasets(gamma, n):
+    """ Generate the data-sets used by each trial: polynomials (1-4), an ellipse, and a rectangle. 
+    Generate these once and pass them to each trial to reuse them over a sweep of C.
+
+    :param gamma: Minimum distance between the points and decision boundary.
+    :param n: Number of data.
+    :return: List of the six data-sets, as returned by Benchmark.
+    """
+    d_p1, d_p2, d_p3, d_p4 = [Benchmark.generate_polynomial(n, gamma, a) for a in range(1, 5)]
+    d_e, d_r = Benchmark.generate_ellipse(n, gamma), Benchmark.generate_rectangle(n, gamma)
+
+    return [d_p1, d_p2, d_p3, d_p4, d_e, d_r]
+
+
+def fit_svc(d, ell, c, phi, gram=None):
+    """ Fit an SVC to the given data. If a Gram matrix cache is given, the kernel matrix is computed 
+    once per data-set and kernel, and shared by every fit with a different C.
+
+    :param d: Matrix of training points.
+    :param ell: Labels of the training points.
+    :param c: Complexity penalty.
+    :param phi: Kernel function to use. There exists: linear, polynomial, rbf, and sigmoid.
+    :param gram: GramCache to fit through. If None, SVC computes the kernel itself.
+    :return: Fitted classifier.
+    """
+    if gram is not None:
+        return gram.fit(d, ell, phi, c)
+
+    from sklearn import svm
+    return svm.SVC(C=c, kernel=phi).fit(d, ell)
+
+
+def trial_pd(f, gamma, n, c, phi, gram=None, datasets=None):
     """ Run the specific trial for the given margin (gamma), number of points (N), 
     and the complexity penalty (c). Record the distance of each point to the decision boundary in 
     the feature space, and the distance of each point to the classifying boundary in the vector 
@@ -27,45 +62,34 @@ def trial_pd(f, gamma, n, c, phi):
     :param n: Number of data.
     :param c: Complexity penalty.
     :param phi: Kernel function to use. There exists: linear, polynomial, rbf, and sigmoid.
+    :param gram: GramCache to share kernel matrices through. If None, each fit computes its own.
+    :param datasets: Data-sets from trial_datasets. If None, new data-sets are generated.
     :return: None.
     """
-    d_from_line = lambda x, b_line: Point(x[0], x[1]).distance(b_line)
-    d_from_polyg = lambda x, b_shape: Point(x[0], x[1]).distance(b_shape.exterior)
-
-    # Generate our data for polynomials (1-4), ellipses, and rectangles.
-    d_p1, d_p2, d_p3, d_p4 = [Benchmark.generate_polynomial(n, gamma, a) for a in range(1, 5)]
-    d_e, d_r = Benchmark.generate_ellipse(n, gamma), Benchmark.generate_rectangle(n, gamma)
-
-    # For each p* data-set, fit and record the distances to decision boundary and classifier.
-    for d_p in [d_p1, d_p2, d_p3, d_p4]:
-        clf = svm.SVC(c, kernel=phi)
-        clf.fit(d_p[0], d_p[1])
+    import shapely
 
-        # Find the distance to the decision boundary, and to the classifier.
-        delta_db = np.array(list(map(d_from_line, d_p)))
-        delta_clf = np.array(clf.decision_function(d_p))
+    d_from_line = lambda x, b_line: shapely.distance(shapely.points(x), b_line)
+    d_from_polyg = lambda x, b_shape: shapely.distance(shapely.points(x), b_shape.exterior)
 
-        # Record each set of distances in a different line.
-        for d in [delta in [delta_db, delta_clf]]:
-            list(map(lambda d_i: f.write(str(d_i)), d))
-            f.write('\n')
+    # Generate our data for polynomials (1-4), ellipses, and rectangles.
+    datasets = trial_datasets(gamma, n) if datasets is None else datasets
 
-    # For each polygon, fit and record the distances to decision boundary and classifier.
-    for d_poly in [d_e, d_r]:
-        clf = svm.SVC(c, kernel=phi)
-        clf.fit(d_poly[0], d_poly[1])
+    # For each data-set, fit and record the distances to decision boundary and classifier.
+    for a, d_p in enumerate(datasets):
+        d, ell = np.asarray(d_p[0]), np.asarray(d_p[1])
+        clf = fit_svc(d, ell, c, phi, gram)
 
         # Find the distance to the decision boundary, and to the classifier.
-        delta_db = np.array(list(map(d_from_polyg, d_p)))
-        delta_clf = np.array(clf.decision_function(d_p))
+        delta_db = d_from_line(d, d_p[2]) if a < 4 else d_from_polyg(d, d_p[2])
+        delta_clf = np.array(clf.decision_function(d))
 
         # Record each set of distances in a different line.
-        for d in [delta in [delta_db, delta_clf]]:
-            list(map(lambda d_i: f.write(str(d_i)), d))
+        for delta in [delta_db, delta_clf]:
+            list(map(lambda d_i: f.write(str(d_i) + ','), delta))
             f.write('\n')
 
 
-def trial_cm(f, gamma, n, c, phi):
+def trial_cm(f, gamma, n, c, phi, gram=None, datasets=None):
     """ Run the specific trial for the given margin (gamma), number of points (N), 
     and the complexity penalty (c). We restrict half the data to train the SVC, and obtain the 
     confusion matrix based on the latter half of the data. Record the number of false positives, 
@@ -76,26 +100,22 @@ def trial_cm(f, gamma, n, c, phi):
     :param n: Number of data.
     :param c: Complexity penalty.
     :param phi: Kernel function to use. There exists: linear, polynomial, rbf, and sigmoid.
+    :param gram: GramCache to share kernel matrices through. If None, each fit computes its own.
+    :param datasets: Data-sets from trial_datasets. If None, new data-sets are generated.
     :return: None.
     """
-    training_d = lambda dl: [dl[i] for i in range(0, int(len(dl) / 2))]
-    testing_d = lambda dl: [dl[i] for i in range(int(len(dl) / 2), len(dl))]
-
     # Generate our data for polynomials (1-4), ellipses, and rectangles.
-    d_p1, d_p2, d_p3, d_p4 = [Benchmark.generate_polynomial(n, gamma, a) for a in range(1, 5)]
-    d_e, d_r = Benchmark.generate_ellipse(n, gamma), Benchmark.generate_rectangle(n, gamma)
+    datasets = trial_datasets(gamma, n) if datasets is None else datasets
 
     # For each data-set, fit with half the data, and record the confusion matrix with other half.
-    for d_p in [d_p1, d_p2, d_p3, d_p4, d_e, d_r]:
-        tp, fp, tn, fn = [0 for a in range(0, 4)]
+    for d_p in datasets:
+        d, ell = np.asarray(d_p[0]), np.asarray(d_p[1])
+        training, testing = split_halves(len(d))
 
-        clf = svm.SVC(c, kernel=phi)
-        clf.fit(training_d(d_p[0]), training_d(d_p[1]))
+        clf = fit_svc(d[training], ell[training], c, phi, gram)
 
-        # Attach the labels to each point, loop through each point and record confusion matrix.
-        for t_d in zip(testing_d[d_p[0]], testing_d[d_p[1]]):
-            p_vs_a = lambda p, a: 1 if clf.predict([t_d[0], t_d[1]]) == p and t_d[2] == a else 0
-            tp, fp, tn, fn = list(map(p_vs_a, [[1, 1], [1, -1], [-1, -1], [-1, 1]]))
+        # Predict every testing point at once, and count the confusion matrix in one pass.
+        tp, fp, tn, fn = evaluate(clf, d[testing], ell[testing]).confusion
 
         # Record each confusion matrix in a different line.
         list(map(lambda r: f.write(str(r) + ','), [tp, fp, tn, fn]))
@@ -5,9 +5,27 @@ Description: This file contains a set of methods (wrapped in a Visualize class)
              training data and decision boundary curves. 
 """""
 
+import os
+import sys
+
 import numpy as np
-from matplotlib import pyplot as plt
-from shapely.geometry import LineString, Polygon
+
+
+def pyplot():
+    """ Import pyplot on first use. Without a display (e.g. on a headless node), select the Agg 
+    backend first, unless a backend has been chosen already.
+
+    :return: The matplotlib.pyplot module.
+    """
+    import matplotlib
+
+    headless = sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or
+                                                         os.environ.get("WAYLAND_DISPLAY"))
+    if headless and "matplotlib.pyplot" not in sys.modules and "MPLBACKEND" not in os.environ:
+        matplotlib.use("Agg")
+
+    from matplotlib import pyplot as plt
+    return plt
 
 
 class Visualize(object):
@@ -18,6 +36,13 @@ class Visualize(object):
     # Step size to generate meshgrid for.
     SSM = 0.002
 
+    # The adaptive mesh starts on a grid of step SSM * 2^CSL. Predict in chunks of CHUNK points.
+    CSL = 5
+    CHUNK = 2 ** 16
+
+    # Artists of the current dynamic plot, kept between frames.
+    __frame = {}
+
     @staticmethod
     def __parse_line(b, scale):
         """
@@ -26,6 +51,8 @@ class Visualize(object):
         :param scale: The axis to display.
         :return: X and Y coordinates to pass to Matplotlib.
         """
+        from shapely.geometry import LineString, Polygon
+
         if type(b) == LineString:
             return b.coords.xy[0], b.coords.xy[1]
         elif type(b) == Polygon:
@@ -35,7 +62,62 @@ class Visualize(object):
             return b_x, b_x * -b[1] / b[2] - b[0] / b[2]
 
     @staticmethod
-    def plot_clf(d, clf, show=False, dynamic=False, pause=0.01):
+    def __predict(clf, x, y):
+        """ Predict the label of each point (x[i], y[i]), in chunks of at most CHUNK points.
+
+        :param clf: Classifying object (SVC).
+        :param x: X coordinates of the points.
+        :param y: Y coordinates of the points.
+        :return: Vector of predicted labels.
+        """
+        z = np.empty(len(x))
+        for a in range(0, len(x), Visualize.CHUNK):
+            z[a:a + Visualize.CHUNK] = clf.predict(np.c_[x[a:a + Visualize.CHUNK],
+                                                         y[a:a + Visualize.CHUNK]])
+
+        return z
+
+    @staticmethod
+    def __adaptive_mesh(clf, x, y):
+        """ Predict the label of each node of the mesh x * y. Start with the nodes of a coarse grid, 
+        then halve the step until we reach the full mesh. At each step, a new node whose enclosing 
+        coarse cell has the same label at all four corners takes that label. Only nodes in cells 
+        that the decision boundary passes through are predicted.
+        
+        :param clf: Classifying object (SVC).
+        :param x: X coordinates of the mesh. Length must be a multiple of 2^CSL, plus one.
+        :param y: Y coordinates of the mesh. Length must be a multiple of 2^CSL, plus one.
+        :return: Matrix of predicted labels, of size len(y) x len(x).
+        """
+        z, s = np.empty((len(y), len(x))), 2 ** Visualize.CSL
+
+        # Predict the coarse grid outright.
+        r, c = [a.ravel() for a in np.meshgrid(np.arange(0, len(y), s), np.arange(0, len(x), s),
+                                               indexing='ij')]
+        z[r, c] = Visualize.__predict(clf, x[c], y[r])
+
+        while s > 1:
+            # New nodes lie on the grid of the next step, but not on the current one.
+            h = s // 2
+            r, c = [a.ravel() for a in np.meshgrid(np.arange(0, len(y), h), np.arange(0, len(x), h),
+                                                   indexing='ij')]
+            new = (r % s != 0) | (c % s != 0)
+            r, c = r[new], c[new]
+
+            # Find the labels at the corners of the enclosing cell of the current step.
+            r_0, c_0 = np.minimum(r // s * s, len(y) - 1 - s), np.minimum(c // s * s, len(x) - 1 - s)
+            z_0 = z[r_0, c_0]
+            uniform = (z_0 == z[r_0 + s, c_0]) & (z_0 == z[r_0, c_0 + s]) & \
+                      (z_0 == z[r_0 + s, c_0 + s])
+
+            z[r[uniform], c[uniform]] = z_0[uniform]
+            z[r[~uniform], c[~uniform]] = Visualize.__predict(clf, x[c[~uniform]], y[r[~uniform]])
+            s = h
+
+        return z
+
+    @staticmethod
+    def plot_clf(d, clf, show=False, dynamic=False, pause=0.01, adaptive=True):
         """ Plot the classifying curve as defined by our classifier 'clf'. If desired, the call 
         to "plt.show()" and "plt.ion" can be omitted.
         
@@ -44,17 +126,29 @@ class Visualize(object):
         :param show: If false, do not call "plt.show()".
         :param dynamic: If false, do not call "plt.ion()".
         :param pause: Number of seconds to pause plot for.
+        :param adaptive: If false, predict every node of the mesh instead of refining a coarse one.
         """
-        d_hat = np.array(d)
+        plt, d_hat = pyplot(), np.array(d)
 
-        # Define a mesh of points to plot in.
-        xx, yy = np.meshgrid(np.arange(d_hat[:,0].min() - 1, d_hat[:,0].max() + 1, Visualize.SSM),
-                             np.arange(d_hat[:,1].min() - 1, d_hat[:,1].max() + 1, Visualize.SSM))
+        # Define a mesh of points to plot in. Pad it to a whole number of coarse cells.
+        s = 2 ** Visualize.CSL if adaptive else 1
+        x_0, y_0 = d_hat[:,0].min() - 1, d_hat[:,1].min() - 1
+        n_x = int(np.ceil((d_hat[:,0].max() + 1 - x_0) / (Visualize.SSM * s))) * s + 1
+        n_y = int(np.ceil((d_hat[:,1].max() + 1 - y_0) / (Visualize.SSM * s))) * s + 1
+        x, y = x_0 + np.arange(n_x) * Visualize.SSM, y_0 + np.arange(n_y) * Visualize.SSM
 
         # Plot classifer.
-        z = clf.predict(np.c_[xx.ravel(), yy.ravel()])
-        z = z.reshape(xx.shape)
-        plt.contourf(xx, yy, z, cmap=plt.cm.coolwarm, alpha=0.8)
+        if adaptive:
+            z = Visualize.__adaptive_mesh(clf, x, y)
+        else:
+            xx, yy = np.meshgrid(x, y)
+            z = Visualize.__predict(clf, xx.ravel(), yy.ravel()).reshape(xx.shape)
+        # In dynamic mode, replace the surface of the previous frame. This changes the background.
+        surface = Visualize.__frame.get("surface")
+        if dynamic and surface is not None and surface.axes is plt.gca():
+            surface.remove()
+        Visualize.__frame["surface"] = plt.contourf(x, y, z, cmap=plt.cm.coolwarm, alpha=0.8)
+        Visualize.__frame["background"] = None
 
         # Dynamic mode must be toggled off to call show.
         show and not dynamic and plt.show()
@@ -63,10 +157,34 @@ class Visualize(object):
         not show and dynamic and plt.pause(pause)
 
     @staticmethod
-    def plot_2d(d, ell, b_star=None, focus=None, scale=1, show=False, dynamic=False, pause=0.01):
+    def __draw_frame(fig, ax, artists, blit):
+        """ Draw the current frame of a dynamic plot. If blitting, restore the saved background 
+        (captured on the first frame, or after the background changes) and redraw only our artists.
+
+        :param fig: Figure being animated.
+        :param ax: Axes being animated.
+        :param artists: Artists to redraw over the background.
+        :param blit: If false, leave drawing to "plt.pause()".
+        :return: None.
+        """
+        if not blit:
+            return
+
+        if Visualize.__frame.get("background") is None:
+            fig.canvas.draw()
+            Visualize.__frame["background"] = fig.canvas.copy_from_bbox(ax.bbox)
+
+        fig.canvas.restore_region(Visualize.__frame["background"])
+        [ax.draw_artist(a) for a in artists]
+        fig.canvas.blit(ax.bbox)
+
+    @staticmethod
+    def plot_2d(d, ell, b_star=None, focus=None, scale=1, show=False, dynamic=False, pause=0.01,
+                blit=False):
         """ Produce a plot given the data-set "d". If defined, draw the decision boundary curve 
         from "b_star" and adjust the axis according to "scale". If desired, the call to 
-        "plt.show()" and "plt.ion" can be omitted.
+        "plt.show()" and "plt.ion" can be omitted. In dynamic mode, the artists of the previous 
+        frame are kept and only updated where the data-set, focus or boundary changed.
         
         :param d: Data-set containing matrix of size n x 2.
         :param ell: Labels of same length as 'd', who correspond to the points in d.
@@ -76,31 +194,53 @@ class Visualize(object):
         :param show: If false, do not call "plt.show()".
         :param dynamic: If false, do not call "plt.ion()".
         :param pause: Number of seconds to pause plot for.
-        :param flash_b: Used to indicate that we have found a solution. Flashes "b" curve.
+        :param blit: If true (and dynamic), redraw only our artists over a saved background.
         :return: None.
         """
         assert len(d[0]) == 2 and len(d) == len(ell)
-
-        # Enable interactive mode if desired. Clear the previous plot.
-        dynamic and plt.cla() and plt.ion()
-
-        # Plot our data-set. Colored red and blue.
-        [plt.scatter(d[i][0], d[i][1], c=("b" if ell[i] == -1 else "r")) for i in range(0, len(d))]
-        plt.axis([-scale, scale, -scale, scale])
+        plt, d_hat, ell_hat = pyplot(), np.asarray(d), np.asarray(ell)
+        frame, ax = Visualize.__frame, plt.gca()
+
+        # Start a new set of artists unless we are continuing a dynamic plot on the same axes.
+        if not dynamic or frame.get("points") is None or frame["points"][0].axes is not ax:
+            # Enable interactive mode if desired. Clear the previous plot.
+            dynamic and (plt.cla(), plt.ion())
+            frame.clear()
+
+            # One collection per class. Colored red and blue. Focus and boundary start empty.
+            # Only blitted artists are animated. Animated artists are skipped by a normal draw.
+            animated = dynamic and blit
+            frame["points"] = [plt.scatter([], [], c=a, animated=animated) for a in ["b", "r"]]
+            frame["focus"] = plt.scatter([], [], s=80, facecolors='none', edgecolors='m',
+                                         animated=animated)
+            frame["b_star"] = plt.plot([], [], "--", c="k", animated=animated)[0]
+            plt.axis([-scale, scale, -scale, scale])
+
+        # Plot our data-set, if it has changed since the last frame. Only dynamic plots keep a copy
+        # of it to compare the next frame against.
+        if frame.get("d") is None or not (np.array_equal(frame["d"], d_hat) and
+                                          np.array_equal(frame["ell"], ell_hat)):
+            frame["points"][0].set_offsets(d_hat[ell_hat == -1].reshape(-1, 2))
+            frame["points"][1].set_offsets(d_hat[ell_hat != -1].reshape(-1, 2))
+            dynamic and frame.update(d=d_hat.copy(), ell=ell_hat.copy())
 
         # Circle the focus point if defined.
-        if focus is not None:
-            plt.scatter(focus[0], focus[1], s=80, facecolors='none', edgecolors='m')
+        frame["focus"].set_offsets(np.reshape([] if focus is None else focus[0:2], (-1, 2)))
+
+        # If defined (and changed), plot the decision boundary.
+        if b_star is not frame.get("b"):
+            db_x, db_y = Visualize.__parse_line(b_star, scale) if b_star is not None else ([], [])
+            frame["b_star"].set_data(db_x, db_y)
+            frame["b"] = b_star
 
-        # If defined, plot the decision boundary.
-        if b_star is not None:
-            db_x, db_y = Visualize.__parse_line(b_star, scale)
-            plt.plot(db_x, db_y, "--", c="k")
+        Visualize.__draw_frame(ax.figure, ax, frame["points"] + [frame["focus"], frame["b_star"]],
+                               dynamic and blit)
 
         # Dynamic mode must be toggled off to call show.
         show and not dynamic and plt.show()
 
-        # Dynamic mode must be on, show must be off to pause.
-        not show and dynamic and plt.pause(pause)
+        # Dynamic mode must be on, show must be off to pause. Blitting has drawn the frame already.
+        not show and dynamic and not blit and plt.pause(pause)
+        not show and dynamic and blit and ax.figure.canvas.start_event_loop(pause)
 
         return 0